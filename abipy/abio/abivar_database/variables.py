@@ -470,9 +470,14 @@ class Variable(object):
 
     def html_link(self, label=None):
         """String with the URL of the web page."""
-        label = self.name if label is None else label
+        if label is None or label == self.name: return self._html_link_name
         return '<a href="%s" target="_blank">%s</a>' % (self.website_url, label)
 
+    @lazy_property
+    def _html_link_name(self):
+        """HTML link with the name of the variable used as label. Computed only once."""
+        return '<a href="%s" target="_blank">%s</a>' % (self.website_url, self.name)
+
     def get_parent_names(self):
         """
         Return set of strings with the name of the parents
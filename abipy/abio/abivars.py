@@ -1,5 +1,6 @@
 """This module contains lookup table with the name of the ABINIT variables."""
 import os
+import re
 import warnings
 import numpy as np
 
@@ -10,7 +11,7 @@ from monty.termcolor import cprint
 from pymatgen.core.units import bohr_to_ang
 from abipy.core.structure import Structure, dataframes_from_structures
 from abipy.core.mixins import Has_Structure, TextFile, NotebookWriter
-from abipy.abio.abivar_database.variables import get_codevars
+from abipy.abio.abivars_db import abinit_varnames, anaddb_varnames
 
 __all__ = [
     "is_abivar",
@@ -23,15 +24,12 @@ __all__ = [
 
 def is_anaddb_var(varname):
     """True if varname is a valid Anaddb variable."""
-    return varname in get_codevars()["anaddb"]
+    return varname in anaddb_varnames()
 
 
 def is_abivar(varname):
     """True if s is an ABINIT variable."""
-    # Add include statement
-    # FIXME: These variables should be added to the database.
-    extra = ["include", "xyzfile"]
-    return varname in get_codevars()["abinit"] or varname in extra
+    return varname in abinit_varnames()
 
 
 # TODO: Move to new directory
@@ -128,6 +126,9 @@ def str2array(obj, dtype=float):
     return np.fromstring(s, sep=" ", dtype=dtype)
 
 
+_RE_SQRT = re.compile(r"[+|-]?sqrt\((.+)\)")
+
+
 def eval_abinit_operators(tokens):
     """
     Receive a list of strings, find the occurences of operators supported
@@ -138,15 +139,13 @@ def eval_abinit_operators(tokens):
         This function is not recursive hence expr like sqrt(1/2) are not supported
     """
     import math # noqa: F401
-    import re
-    re_sqrt = re.compile(r"[+|-]?sqrt\((.+)\)")
 
     values = []
     for tok in tokens:
         if tok.startswith("'") or tok.startswith('"'):
             values.append(tok)
         else:
-            m = re_sqrt.match(tok)
+            m = _RE_SQRT.match(tok)
             if m:
                 tok = tok.replace("sqrt", "math.sqrt")
                 tok = str(eval(tok))
@@ -1,7 +1,8 @@
 """Database with the names of the input variables used in Abinit and in other main programs."""
 import sys
+import re
 
-from collections import OrderedDict
+from functools import lru_cache
 
 
 ##############
@@ -9,18 +10,34 @@ from collections import OrderedDict
 ##############
 
 
+@lru_cache(maxsize=1)
 def get_abinit_variables():
     """Returns the database with the description of the ABINIT variables."""
     from abipy.abio.abivar_database.variables import get_codevars
     return get_codevars()["abinit"]
 
 
+@lru_cache(maxsize=1)
 def get_anaddb_variables():
     """Returns the database with the description of the ANADDB variables."""
     from abipy.abio.abivar_database.variables import get_codevars
     return get_codevars()["anaddb"]
 
 
+@lru_cache(maxsize=1)
+def abinit_varnames():
+    """Frozenset with the names of the ABINIT variables. Used to validate input files."""
+    # Add include statement
+    # FIXME: These variables should be added to the database.
+    return frozenset(get_abinit_variables()).union(["include", "xyzfile"])
+
+
+@lru_cache(maxsize=1)
+def anaddb_varnames():
+    """Frozenset with the names of the ANADDB variables. Used to validate input files."""
+    return frozenset(get_anaddb_variables())
+
+
 def docvar(varname, executable="abinit"):
     """Return the `Variable` object associated to this name."""
     from abipy.abio.abivar_database.variables import get_codevars
@@ -39,33 +56,62 @@ def abinit_help(varname, info=True, stream=sys.stdout):
         return stream.write("Variable %s not in database" % varname)
 
     text = "## Default value: %s\n## Description:\n\n%s\n" % (str(var.defaultval), var.text)
-
-    if info: text += str(var.info)
+    # Highlight wikilinks. Variable.info is not included as brackets have been already removed.
     text = text.replace("[[", "\033[1m").replace("]]", "\033[0m")
+    if info: text += str(var.info)
 
     # FIXME: There are unicode chars in abinit doc (Greek symbols)
     try:
         stream.write(text)
     except UnicodeEncodeError:
-        stream.write(text.encode('ascii', 'ignore'))
+        # Text streams encode the full string before writing so nothing has been written yet.
+        # Drop the characters that cannot be represented with the encoding of the stream.
+        encoding = getattr(stream, "encoding", None) or "ascii"
+        stream.write(text.encode(encoding, "ignore").decode(encoding))
     stream.write("\n")
 
 
+# Variable names are valid identifiers so we scan the text once, token by token,
+# and use a dict lookup instead of an alternation with hundreds of branches.
+_VARNAME_RE = re.compile(r"[A-Za-z_]\w*")
+
+# Cache used by repr_html_from_abinit_string.
+_HTML_LINKS = None
+
+
+def _get_html_links():
+    """
+    Return the dictionary used by `repr_html_from_abinit_string`
+    to replace variable names with HTML links. Built only once.
+    """
+    global _HTML_LINKS
+    if _HTML_LINKS is None:
+        # Variables are matched by full token so there is no need to sort the names by length.
+        _HTML_LINKS = {vname: var.html_link() for vname, var in get_abinit_variables().items()}
+
+    return _HTML_LINKS
+
+
 def repr_html_from_abinit_string(text):
     """
     Given a string `text` with an Abinit input file, replace all variables
     with HTML links pointing to the official documentation. Return new string.
     """
-    var_database = get_abinit_variables()
-
-    # https://stackoverflow.com/questions/6116978/python-replace-multiple-strings
-    # define desired replacements here e.g. rep = {"condition1": "", "condition2": "text"}
-    # ordered dict and sort by length is needed because variable names can overlap e.g. kpt, kptopt pair
-    import re
-    rep = {vname: var.html_link(label=vname) for vname, var in var_database.items()}
-    rep = OrderedDict([(re.escape(k), rep[k]) for k in sorted(rep.keys(), key=lambda n: len(n), reverse=True)])
-
-    # Use these three lines to do the replacement
-    pattern = re.compile("|".join(rep.keys()))
-    text = pattern.sub(lambda m: rep[re.escape(m.group(0))], text)
+    # Fast path for text without identifiers: no need to load the database.
+    if _VARNAME_RE.search(text) is None:
+        return text.replace("\n", "<br>")
+
+    rep = _get_html_links()
+
+    def repl(m):
+        word = m.group(0)
+        if word in rep: return rep[word]
+        # Handle dataset index e.g. ecut12
+        vname = word.rstrip("0123456789")
+        if vname in rep: return rep[vname] + word[len(vname):]
+        return word
+
+    # Newlines are replaced in a separate pass on purpose: str.replace runs in C
+    # while adding "\n" to the regex would invoke the Python callback once per line.
+    text = _VARNAME_RE.sub(repl, text)
     return text.replace("\n", "<br>")
@@ -1277,18 +1277,10 @@ with the Abinit version you are using. Please contact the AbiPy developers.""" %
             raise self.Error("The number of variables must equal the number of lists\n"
                              "varnames: %s\nvalues %s" % (str(varnames), str(values)))
 
-        # TODO: group varnames and varvalues!
-        #varnames = [t[0] for t in items]
-        #values = [t[1] for t in items]
-
-        varnames = [ [varnames[i]] * len(values[i]) for i in range(len(values))]
-        varnames = itertools.product(*varnames)
-        values = itertools.product(*values)
-
         inps = []
-        for names, values in zip(varnames, values):
+        for combo in itertools.product(*values):
             inp = self.deepcopy()
-            inp.set_vars(**{k: v for k, v in zip(names, values)})
+            inp.set_vars(**dict(zip(varnames, combo)))
             inp.enforce_znucl_and_typat(self.enforce_znucl, self.enforce_typat)
             inps.append(inp)
 
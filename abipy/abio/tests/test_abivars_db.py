@@ -2,7 +2,8 @@
 import sys
 
 from abipy.core.testing import AbipyTest
-from abipy.abio.abivars_db import get_abinit_variables, abinit_help, docvar
+from abipy.abio.abivars_db import (get_abinit_variables, get_anaddb_variables, abinit_help, docvar,
+    abinit_varnames, anaddb_varnames)
 
 
 class AbinitVariableDatabaseTest(AbipyTest):
@@ -25,6 +26,13 @@ class AbinitVariableDatabaseTest(AbipyTest):
             if sys.version[0:3] > '2.7':
                 str(var._repr_html_())
 
+        # Frozensets with the names used to validate input files.
+        varnames = abinit_varnames()
+        assert varnames is abinit_varnames()
+        assert "ecut" in varnames and "include" in varnames and "foobar" not in varnames
+        assert anaddb_varnames() == frozenset(get_anaddb_variables())
+        assert "ifcflag" in anaddb_varnames()
+
         # Database methods.
         database.apropos("ecut")
         #assert len(database.json_dumps_varnames())
@@ -64,6 +72,12 @@ class AbinitVariableDatabaseTest(AbipyTest):
         abinit_help("ecut", info=True)
         # Should not raise
         abinit_help("foobar", info=True)
+        # The documentation of ionmov contains non-ASCII characters.
+        import io
+        stream = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+        abinit_help("ionmov", info=False, stream=stream)
+        stream.seek(0)
+        assert "Description" in stream.read()
 
         ecut_var = docvar("ecut")
         assert ecut_var.name == "ecut"
@@ -73,3 +87,18 @@ class AbinitVariableDatabaseTest(AbipyTest):
         assert elaflag.name == "elaflag"
         assert elaflag.executable == "anaddb"
         assert str(elaflag._repr_html_())
+
+    def test_repr_html_from_abinit_string(self):
+        """Testing repr_html_from_abinit_string."""
+        from abipy.abio.abivars_db import repr_html_from_abinit_string
+        html = repr_html_from_abinit_string("ecut 10\nkptopt 1\n")
+        assert html.count("<br>") == 2
+        assert docvar("kptopt").html_link(label="kptopt") in html
+        assert docvar("ecut").html_link(label="ecut") in html
+        # Second call should reuse the cached pattern and give the same result.
+        assert repr_html_from_abinit_string("ecut 10\nkptopt 1\n") == html
+        # Variables with dataset index are linked, names inside other words are not.
+        html = repr_html_from_abinit_string("ecut12 10\n# executable = abinit")
+        assert docvar("ecut").html_link(label="ecut") + "12 10" in html
+        assert "executable = abinit" in html
+        assert repr_html_from_abinit_string("1 2 3\n4.0") == "1 2 3<br>4.0"
@@ -9,6 +9,7 @@ from io import StringIO
 from monty.functools import lazy_property
 from abipy.tools.plotting import add_fig_kwargs, get_ax_fig_plt, data_from_cplx_mode
 from abipy.tools.derivatives import finite_diff
+from abipy.tools.numtools import lttb_downsample
 
 __all__ = [
     "Function1D",
@@ -521,6 +522,8 @@ class Function1D(object):
                         "im" for the imaginary part, "abs" for the absolute value.
                         "angle" to display the phase of the complex number in radians.
                         Options can be concatenated with "-"
+        max_points      If not None, the curve is downsampled to max_points points
+                        with the LTTB algorithm to reduce the size of the figure.
         ==============  ===============================================================
         """
         from abipy.tools.plotting import PlotlyRowColDesc
@@ -537,9 +540,11 @@ class Function1D(object):
         showlegend = False
         if "name" in kwargs: showlegend = True
         showlegend = kwargs.pop("showlegend", showlegend)
+        max_points = kwargs.pop("max_points", None)
 
         for c in cplx_mode.lower().split("-"):
             xx, yy = self.mesh, data_from_cplx_mode(c, self.values)
+            if max_points is not None: xx, yy = lttb_downsample(xx, yy, max_points)
             if xfactor != 1: xx = xx * xfactor
             if yfactor != 1: yy = yy * yfactor
 
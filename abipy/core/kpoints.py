@@ -1029,7 +1029,7 @@ class KpointList(collections.abc.Sequence):
 
     def get_cart_coords(self):
         """Cartesian coordinates of the k-point as |numpy-array| of shape (len(self), 3)"""
-        return np.reshape([k.cart_coords for k in self], (-1, 3))
+        return self.reciprocal_lattice.get_cartesian_coords(self.frac_coords)
 
     @property
     def names(self):
@@ -806,20 +806,13 @@ class SkwInterpolator(ElectronInterpolator):
             self.skr[ik] = self.get_stark(kpt)
 
         # Build H(k,k') matrix (Hermitian)
-        hmat = np.empty((nkpt-1, nkpt-1), dtype=complex)
-        for jk in range(nkpt-1):
-            v_jkr = self.skr[jk, 1:] - self.skr[nkpt-1, 1:]
-            #for ik in range(jk + 1):
-            for ik in range(nkpt-1):
-                v_ikr = inv_rhor[1:] * (self.skr[ik, 1:] - self.skr[nkpt-1, 1:])
-                hmat[ik, jk] = np.vdot(v_jkr, v_ikr)
-                if ik == jk: hmat[ik, jk] = hmat[ik, jk].real
+        # H[ik, jk] = sum_R inv_rho(R) (S_ik(R) - S_n(R)) (S_jk(R) - S_n(R))^*
+        dskr = self.skr[:nkpt-1, 1:] - self.skr[nkpt-1, 1:]
+        hmat = np.matmul(dskr * inv_rhor[1:], dskr.conj().T)
+        np.fill_diagonal(hmat, hmat.diagonal().real)
 
         # Solving system of linear equations to get lambda coeffients (eq. 10 of PRB 38 2721)..."
-        de_kbs = np.empty((nkpt-1, nband, nsppol), dtype=complex)
-        for spin in range(nsppol):
-            for ib in range(nband):
-                de_kbs[:, ib, spin] = eigens[spin, 0:nkpt-1, ib] - eigens[spin, nkpt-1, ib]
+        de_kbs = np.transpose(eigens[:, 0:nkpt-1, :] - eigens[:, nkpt-1:nkpt, :], (1, 2, 0)).astype(complex)
 
         # Solve all bands and spins at once
         # FIXME: Portability problem with scipy 0.19 in which linalg.solve wraps the expert drivers
@@ -843,14 +836,8 @@ class SkwInterpolator(ElectronInterpolator):
 
         # Compute coefficients.
         self.coefs = np.empty((nsppol, nband, nr), dtype=complex)
-        for spin in range(nsppol):
-            for ib in range(nband):
-                for ir in range(1, nr):
-                    self.coefs[spin, ib, ir] = inv_rhor[ir] \
-                        * np.vdot(self.skr[:nkpt-1, ir] - self.skr[nkpt-1, ir], lmb_kbs[:nkpt-1, ib, spin])
-
-                self.coefs[spin, ib, 0] = eigens[spin, nkpt-1, ib] \
-                    - np.dot(self.coefs[spin, ib, 1:nr], self.skr[nkpt-1, 1:nr])
+        self.coefs[:, :, 1:] = inv_rhor[1:] * np.einsum("kr,kbs->sbr", dskr.conj(), lmb_kbs[:nkpt-1])
+        self.coefs[:, :, 0] = eigens[:, nkpt-1, :] - np.matmul(self.coefs[:, :, 1:], self.skr[nkpt-1, 1:])
 
         # Filter high-frequency.
         self.rcut, self.rsigma = None, None
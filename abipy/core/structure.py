@@ -612,6 +612,19 @@ class Structure(pmg_Structure, NotebookWriter):
         """
         return mp_match_structure(self, **kwargs)
 
+    def mp_match_ids(self, api_key=None, endpoint=None):
+        """
+        Return the list of Materials Project identifiers of the structures matching this one.
+        The matching is done on the server. Contrary to mp_match, the matching structures
+        are not downloaded so this method requires a single request.
+        """
+        from abipy.core import restapi
+        structure = self.copy()
+        # Must use pymatgen structure else server does not know how to handle the JSON doc.
+        structure.__class__ = pmg_Structure
+        with restapi.get_mprester(api_key=api_key, endpoint=endpoint) as rest:
+            return list(rest.find_structure(structure))
+
     def write_cif_with_spglib_symms(self, filename, symprec=1e-3, angle_tolerance=5.0, significant_figures=8,
                                     ret_string=False):
         """
@@ -709,7 +722,7 @@ class Structure(pmg_Structure, NotebookWriter):
 
             rprim = pmg_units.ArrayWithUnit(self.lattice.matrix, "ang").to("bohr")
             #angdeg = structure.lattice.angles
-            xred = np.reshape([site.frac_coords for site in self], (-1, 3))
+            xred = self.frac_coords
 
             # Set small values to zero. This usually happens when the CIF file
             # does not give structure parameters with enough digits.
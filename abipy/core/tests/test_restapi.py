@@ -44,6 +44,7 @@ class TestMpRestApi(AbipyTest):
         assert mp.structures and mp
         assert "mp-134" in mp.ids
         assert mp.data is None and mp.dataframe is None
+        assert "mp-134" in mp.structures[0].mp_match_ids()
         mp.print_results(fmt="abivars", verbose=2)
 
         if self.has_nbformat():
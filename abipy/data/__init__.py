@@ -6,6 +6,7 @@ Preferred way to import the module is via the import syntax:
 """
 import os
 
+from functools import lru_cache
 from abipy.core.structure import Structure
 from abipy.flowtk import Pseudo, PseudoTable
 from abipy.data.ucells import structure_from_ucell
@@ -75,8 +76,12 @@ def structure_from_cif(filename):
 pseudo_dir = _PSEUDOS_DIRPATH
 
 
+@lru_cache(maxsize=None)
 def pseudo(filename):
-    """Returns a `Pseudo` object."""
+    """
+    Returns a `Pseudo` object.
+    The files in data/pseudos are read-only so the object is parsed once and cached.
+    """
     filepath = os.path.join(_PSEUDOS_DIRPATH, filename)
     return Pseudo.from_file(filepath)
 
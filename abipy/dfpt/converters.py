@@ -427,10 +427,10 @@ def get_dm(phonon, qpt_list, structure):
     coord_matrix = np.repeat(structure.cart_coords[np.newaxis, :, :], natom, axis=0)
     diff_coords = np.transpose(coord_matrix, (1, 0, 2)) - coord_matrix
     rlatt = structure.lattice.reciprocal_lattice
-    for q in qpt_list:
-        q_cart = rlatt.get_cartesian_coords(q)
-        # the phase exp(-i * q.r)
-        phase = np.exp(-1j * np.einsum("ijk,k", diff_coords, q_cart))
+    # the phases exp(-i * q.r) for all the q-points at once.
+    qs_cart = rlatt.get_cartesian_coords(np.reshape(qpt_list, (-1, 3)))
+    phases = np.exp(-1j * np.einsum("ijk,qk->qij", diff_coords, qs_cart))
+    for q, phase in zip(qpt_list, phases):
         dm = phonon.get_dynamical_matrix_at_q(q).reshape(natom, 3, natom, 3)
         # the following is rprim * dm[ipert1,:,ipert2,:] * rprim.T
         dm = np.einsum("ij,kjlm,nm->kiln", rprimd, dm, rprimd)
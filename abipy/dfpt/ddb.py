@@ -25,7 +25,7 @@ from abipy.core.symmetries import AbinitSpaceGroup
 from abipy.core.structure import Structure
 from abipy.core.kpoints import KpointList, Kpoint
 from abipy.iotools import ETSF_Reader
-from abipy.tools.numtools import data_from_cplx_mode
+from abipy.tools.numtools import data_from_cplx_mode, lttb_downsample
 from abipy.abio.inputs import AnaddbInput
 from abipy.dfpt.phonons import PhononDosPlotter, PhononBandsPlotter
 from abipy.dfpt.ifc import InteratomicForceConstants
@@ -1253,6 +1253,31 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         self.write(filepath, filter_blocks=map_fine_to_coarse)
         return self.__class__(filepath)
 
+    def _anaget_phbands_and_phdos(self, asr, chneut, dipdip, **kwargs):
+        """
+        Helper function used by the anacompare methods.
+        Invoke anaddb and return (phbands, phdos). phdos is None if the DOS is not computed.
+        kwargs are passed to anaget_phbst_and_phdos_files.
+        """
+        phbst_file, phdos_file = self.anaget_phbst_and_phdos_files(asr=asr, chneut=chneut, dipdip=dipdip,
+                                                                   qptbounds=None, anaddb_kwargs=None,
+                                                                   workdir=None, manager=None, **kwargs)
+        phbands, phdos = phbst_file.phbands, None
+        phbst_file.close()
+        if phdos_file is not None:
+            phdos = phdos_file.phdos
+            phdos_file.close()
+
+        return phbands, phdos
+
+    @staticmethod
+    def _get_anacompare_label(pre_label, asr, dipdip, chneut):
+        """Label used by the anacompare methods."""
+        if pre_label is not None:
+            return "%s (asr: %d, dipdip: %d, chneut: %d)" % (pre_label, asr, dipdip, chneut)
+        else:
+            return "asr: %d, dipdip: %d, chneut: %d" % (asr, dipdip, chneut)
+
     def anacompare_asr(self, asr_list=(0, 2), chneut_list=(1,), dipdip=1, lo_to_splitting="automatic",
                        nqsmall=10, ndivsm=20, dos_method="tetra", ngqpt=None,
                        verbose=0, mpi_procs=1, pre_label=None):
@@ -1288,23 +1313,12 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         phbands_plotter = PhononBandsPlotter()
 
         for asr, chneut in itertools.product(asr_list, chneut_list):
-            phbst_file, phdos_file = self.anaget_phbst_and_phdos_files(
-                nqsmall=nqsmall, ndivsm=ndivsm, asr=asr, chneut=chneut, dipdip=dipdip, dos_method=dos_method,
-                lo_to_splitting=lo_to_splitting, ngqpt=ngqpt, qptbounds=None,
-                anaddb_kwargs=None, verbose=verbose, mpi_procs=mpi_procs, workdir=None, manager=None)
+            phbands, phdos = self._anaget_phbands_and_phdos(
+                asr, chneut, dipdip, nqsmall=nqsmall, ndivsm=ndivsm, dos_method=dos_method,
+                lo_to_splitting=lo_to_splitting, ngqpt=ngqpt, verbose=verbose, mpi_procs=mpi_procs)
 
-            if pre_label is not None:
-                label = "%s (asr: %d, dipdip: %d, chneut: %d)" % (pre_label, asr, dipdip, chneut)
-            else:
-                label = "asr: %d, dipdip: %d, chneut: %d" % (asr, dipdip, chneut)
-
-            if phdos_file is not None:
-                phbands_plotter.add_phbands(label, phbst_file.phbands, phdos=phdos_file.phdos)
-                phdos_file.close()
-            else:
-                phbands_plotter.add_phbands(label, phbst_file.phbands)
-
-            phbst_file.close()
+            label = self._get_anacompare_label(pre_label, asr, dipdip, chneut)
+            phbands_plotter.add_phbands(label, phbands, phdos=phdos)
 
         return phbands_plotter
 
@@ -1344,25 +1358,64 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         for dipdip in (0, 1):
             my_chneut_list = chneut_list if dipdip != 0 else [0]
             for chneut in my_chneut_list:
-                phbst_file, phdos_file = self.anaget_phbst_and_phdos_files(
-                    nqsmall=nqsmall, ndivsm=ndivsm, asr=asr, chneut=chneut, dipdip=dipdip, dos_method=dos_method,
-                    lo_to_splitting=lo_to_splitting, ngqpt=ngqpt, qptbounds=None,
-                    anaddb_kwargs=None, verbose=verbose, mpi_procs=mpi_procs, workdir=None, manager=None)
+                phbands, phdos = self._anaget_phbands_and_phdos(
+                    asr, chneut, dipdip, nqsmall=nqsmall, ndivsm=ndivsm, dos_method=dos_method,
+                    lo_to_splitting=lo_to_splitting, ngqpt=ngqpt, verbose=verbose, mpi_procs=mpi_procs)
 
-                if pre_label is not None:
-                    label = "%s (asr: %d, dipdip: %d, chneut: %d)" % (pre_label, asr, dipdip, chneut)
-                else:
-                    label = "asr: %d, dipdip: %d, chneut: %d" % (asr, dipdip, chneut)
-
-                if phdos_file is not None:
-                    phbands_plotter.add_phbands(label, phbst_file.phbands, phdos=phdos_file.phdos)
-                    phdos_file.close()
-                else:
-                    phbands_plotter.add_phbands(label, phbst_file.phbands)
-                phbst_file.close()
+                label = self._get_anacompare_label(pre_label, asr, dipdip, chneut)
+                phbands_plotter.add_phbands(label, phbands, phdos=phdos)
 
         return phbands_plotter
 
+    def anacompare_asr_dipdip(self, asr_list=(0, 2), chneut_list=(1,), lo_to_splitting="automatic",
+                              nqsmall=10, ndivsm=20, dos_method="tetra", ngqpt=None,
+                              verbose=0, mpi_procs=1, num_cpus=1, pre_label=None):
+        """
+        Equivalent to calling ``anacompare_asr(asr_list, chneut_list, dipdip=1)`` and
+        ``anacompare_dipdip(chneut_list, asr=2)`` but anaddb is executed only once for each
+        (asr, chneut, dipdip) combination shared by the two comparisons.
+
+        Args:
+            See anacompare_asr and anacompare_dipdip.
+            num_cpus: Number of threads used to execute the anaddb calculations concurrently.
+
+        Return:
+            (asr_plotter, dipdip_plotter) tuple with two |PhononBandsPlotter| objects.
+        """
+        asr_combs = [(asr, chneut, 1) for asr, chneut in itertools.product(asr_list, chneut_list)]
+        dipdip_combs = [(2, chneut, dipdip) for dipdip in (0, 1) for chneut in (chneut_list if dipdip != 0 else [0])]
+        unique_combs = list(dict.fromkeys(asr_combs + dipdip_combs))
+
+        # Parse the DDB file and compute the q-path before running anaddb so that the (possibly concurrent)
+        # calculations share the cached values instead of computing them in each thread.
+        if ngqpt is None: ngqpt = self.guessed_ngqpt
+        self.has_lo_to_data()
+        self.structure.hsym_kpoints
+
+        def do_work(comb):
+            asr, chneut, dipdip = comb
+            return self._anaget_phbands_and_phdos(
+                asr, chneut, dipdip, nqsmall=nqsmall, ndivsm=ndivsm, dos_method=dos_method,
+                lo_to_splitting=lo_to_splitting, ngqpt=ngqpt, verbose=verbose, mpi_procs=mpi_procs)
+
+        num_cpus = max(1, min(num_cpus, len(unique_combs)))
+        if num_cpus == 1:
+            results = dict(zip(unique_combs, map(do_work, unique_combs)))
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=num_cpus) as executor:
+                results = dict(zip(unique_combs, executor.map(do_work, unique_combs)))
+
+        plotters = []
+        for combs in (asr_combs, dipdip_combs):
+            plotter = PhononBandsPlotter()
+            for asr, chneut, dipdip in combs:
+                phbands, phdos = results[(asr, chneut, dipdip)]
+                plotter.add_phbands(self._get_anacompare_label(pre_label, asr, dipdip, chneut), phbands, phdos=phdos)
+            plotters.append(plotter)
+
+        return tuple(plotters)
+
     def anacompare_phdos(self, nqsmalls, asr=2, chneut=1, dipdip=1, dos_method="tetra", ngqpt=None,
                          verbose=0, num_cpus=1, stream=sys.stdout):
         """
@@ -1398,6 +1451,8 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
             phdos = phdos_file.phdos
             phbst_file.close()
             phdos_file.close()
+            if verbose:
+                print("Computed phonon DOS with nqsmall: %d" % nqsmall, file=stream)
             return phdos
 
         if num_cpus == 1:
@@ -1407,30 +1462,11 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         else:
             # Threads
             if verbose:
-                print("Computing %d phonon DOS with %d threads" % (len(nqsmalls), num_cpus))
-            phdoses = [None] * len(nqsmalls)
-
-            def worker():
-                while True:
-                    nqsm, phdos_index = q.get()
-                    phdos = do_work(nqsm)
-                    phdoses[phdos_index] = phdos
-                    q.task_done()
-
-            from threading import Thread
-            from queue import Queue
-
-            q = Queue()
-            for i in range(num_cpus):
-                t = Thread(target=worker)
-                t.daemon = True
-                t.start()
-
-            for i, nqsmall in enumerate(nqsmalls):
-                q.put((nqsmall, i))
-
-            # block until all tasks are done
-            q.join()
+                print("Computing %d phonon DOS with %d threads" % (len(nqsmalls), num_cpus), file=stream)
+            # The pool preserves the order of nqsmalls and exceptions raised by the workers are propagated.
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=num_cpus) as executor:
+                phdoses = list(executor.map(do_work, nqsmalls))
 
         # Compute relative difference wrt last phonon DOS. Be careful because the DOSes may be defined
         # on different frequency meshes ==> spline on the mesh of the last DOS.
@@ -2367,14 +2403,12 @@ class DielectricTensorGenerator(Has_Structure):
         # TODO: Use SI?
         #fact = 253.2638413
 
-        rows, index = [], []
-        for nu in range(3 * len(self.structure)):
-            d = {k: data_from_cplx_mode(reim, self.oscillator_strength[nu][t], tol=tol) for k, t in dmap.items()}
-            #d = {k: np.around(v * fact, decimals=decimals) for k, v in d.items()}
-            rows.append(d)
-            index.append(nu)
+        # Select the six components for all the modes at once: shape (3 * natom, 6)
+        i, j = np.array(list(dmap.values())).T
+        values = data_from_cplx_mode(reim, np.asarray(self.oscillator_strength)[:, i, j], tol=tol)
+        #values = np.around(values * fact, decimals=decimals)
 
-        df = pd.DataFrame(rows, index=index, columns=list(rows[0].keys()))
+        df = pd.DataFrame(values, index=np.arange(3 * len(self.structure)), columns=list(dmap.keys()))
         df.index.name = "mode"
         return df
 
@@ -2390,7 +2424,14 @@ class DielectricTensorGenerator(Has_Structure):
             units: string specifying the units used for phonon frequencies. Possible values in
             ("eV", "meV", "Ha", "cm-1", "Thz"). Case-insensitive.
         """
-        w = w / phfactor_ev2units(units)
+        return DielectricTensor(self._tensor_on_wmesh([w], gamma_ev, units)[0])
+
+    def _tensor_on_wmesh(self, wmesh, gamma_ev, units):
+        """
+        Compute the dielectric tensor for all the frequencies in wmesh.
+        Return complex array of shape [len(wmesh), 3, 3]. See tensor_at_frequency.
+        """
+        w = np.asarray(wmesh) / phfactor_ev2units(units)
 
         # Note that the acoustic modes are not included: their oscillator strength should be exactly zero
         # Also, only the real part of the oscillators is taken into account:
@@ -2401,16 +2442,17 @@ class DielectricTensorGenerator(Has_Structure):
         else:
             gammas = np.ones(len(self.phfreqs)) * float(gamma_ev)
 
-        t = np.zeros((3, 3), dtype=complex)
-        for i in range(3, len(self.phfreqs)):
-            g = gammas[i] * self.phfreqs[i]
-            t += self.oscillator_strength[i].real / (self.phfreqs[i]**2 - w**2 - 1j*g)
+        phfreqs = self.phfreqs[3:]
+        g = gammas[3:] * phfreqs
+        # Sum over modes for all frequencies at once: [nw, nmodes] x [nmodes, 3, 3] --> [nw, 3, 3]
+        denom = phfreqs[None, :] ** 2 - w[:, None] ** 2 - 1j * g[None, :]
+        t = np.einsum("wn,nij->wij", 1 / denom, self.oscillator_strength[3:].real)
 
         vol = self.structure.volume / bohr_to_angstrom ** 3
         t = 4 * np.pi * t / vol / eV_to_Ha ** 2
-        t += self.epsinf
+        t += np.asarray(self.epsinf)
 
-        return DielectricTensor(t)
+        return t
 
     @add_fig_kwargs
     def plot(self, w_min=0, w_max=None, gamma_ev=1e-4, num=500, component='diag', reim="reim", units='eV',
@@ -2442,10 +2484,7 @@ class DielectricTensorGenerator(Has_Structure):
         Return: |matplotlib-Figure|
         """
         wmesh = self._get_wmesh(gamma_ev, num, units, w_min, w_max)
-        t = np.zeros((num, 3, 3), dtype=complex)
-
-        for i, w in enumerate(wmesh):
-            t[i] = self.tensor_at_frequency(w, units=units, gamma_ev=gamma_ev)
+        t = self._tensor_on_wmesh(wmesh, gamma_ev, units)
 
         ax, fig, plt = get_ax_fig_plt(ax=ax)
 
@@ -2489,7 +2528,7 @@ class DielectricTensorGenerator(Has_Structure):
 
     @add_plotly_fig_kwargs
     def plotly(self, w_min=0, w_max=None, gamma_ev=1e-4, num=500, component='diag', reim="reim", units='eV',
-               with_phfreqs=True, fig=None, rcd=None, fontsize=16, **kwargs):
+               with_phfreqs=True, fig=None, rcd=None, fontsize=16, max_points=None, **kwargs):
         """
         Plots the selected components of the dielectric tensor as a function of frequency with plotly.
 
@@ -2514,14 +2553,12 @@ class DielectricTensorGenerator(Has_Structure):
             fig: |plotly.graph_objects.Figure| or None if a new figure should be created.
             rcd: PlotlyRowColDesc object used when fig is not None to specify the (row, col) of the subplot in the grid.
             fontsize: Legend and label fontsize.
+            max_points: If not None, each curve is downsampled to max_points points with the LTTB algorithm.
 
         Return: |plotly.graph_objects.Figure|
         """
         wmesh = self._get_wmesh(gamma_ev, num, units, w_min, w_max)
-        t = np.zeros((num, 3, 3), dtype=complex)
-
-        for i, w in enumerate(wmesh):
-            t[i] = self.tensor_at_frequency(w, units=units, gamma_ev=gamma_ev)
+        t = self._tensor_on_wmesh(wmesh, gamma_ev, units)
 
         if fig is None:
             fig, _ = get_fig_plotly()
@@ -2536,6 +2573,11 @@ class DielectricTensorGenerator(Has_Structure):
         if 'line_width' not in kwargs:
             kwargs['line_width'] = 2
 
+        def add_scatter(y, **scatter_kwargs):
+            x = wmesh
+            if max_points is not None: x, y = lttb_downsample(x, y, max_points)
+            fig.add_scatter(x=x, y=y, mode='lines', row=ply_row, col=ply_col, **scatter_kwargs, **kwargs)
+
         reimfs = []
         if 're' in reim: reimfs.append((np.real, "Re{%s}"))
         if 'im' in reim: reimfs.append((np.imag, "Im{%s}"))
@@ -2543,25 +2585,22 @@ class DielectricTensorGenerator(Has_Structure):
         for reimf, reims in reimfs:
             if isinstance(component, (list, tuple)):
                 label = reims % r'ε%s%s' % (SUBSCRIPT_UNICODE[str(component[0])],SUBSCRIPT_UNICODE[str(component[1])])
-                fig.add_scatter(x=wmesh, y=reimf(t[:,component[0], component[1]]), mode='lines', showlegend=True,
-                                name=label, row=ply_row, col=ply_col, **kwargs)
+                add_scatter(reimf(t[:,component[0], component[1]]), showlegend=True, name=label)
             elif component == 'diag':
                 for i in range(3):
                     s = SUBSCRIPT_UNICODE[str(i)]
                     label = reims % r'ε%s%s' % (s, s)
-                    fig.add_scatter(x=wmesh, y=reimf(t[:, i, i]), mode='lines', name=label, row=ply_row, col=ply_col, **kwargs)
+                    add_scatter(reimf(t[:, i, i]), name=label)
             elif component in ('all', "offdiag"):
                 for i in range(3):
                     for j in range(3):
                         if component == "all" and i > j: continue
                         if component == "offdiag" and i >= j: continue
                         label = reims % r'ε%s%s' % (SUBSCRIPT_UNICODE[str(i)], SUBSCRIPT_UNICODE[str(j)])
-                        fig.add_scatter(x=wmesh, y=reimf(t[:, i, j]), mode='lines', name=label, row=ply_row,
-                                        col=ply_col, **kwargs)
+                        add_scatter(reimf(t[:, i, j]), name=label)
             elif component == 'diag_av':
                 label = r'Average %s' % (reims % r'εᵢᵢ')
-                fig.add_scatter(x=wmesh, y=np.trace(reimf(t), axis1=1, axis2=2)/3, mode='lines', name=label,
-                                row=ply_row, col=ply_col, **kwargs)
+                add_scatter(np.trace(reimf(t), axis1=1, axis2=2)/3, name=label)
             else:
                 raise ValueError('Unkwnown component {}'.format(component))
 
@@ -2644,10 +2683,7 @@ class DielectricTensorGenerator(Has_Structure):
         Return: |matplotlib-Figure|
         """
         wmesh = self._get_wmesh(gamma_ev, num, units, w_min, w_max)
-        t = np.zeros((num, 3, 3), dtype=complex)
-
-        for i, w in enumerate(wmesh):
-            t[i] = self.tensor_at_frequency(w, units=units, gamma_ev=gamma_ev)
+        t = self._tensor_on_wmesh(wmesh, gamma_ev, units)
 
         ax, fig, plt = get_ax_fig_plt(ax=ax)
 
@@ -2778,10 +2814,7 @@ class DielectricTensorGenerator(Has_Structure):
         """
 
         wmesh = self._get_wmesh(gamma_ev, num, units, w_min, w_max)
-        t = np.zeros((num, 3, 3), dtype=complex)
-
-        for i, w in enumerate(wmesh):
-            t[i] = self.tensor_at_frequency(w, units=units, gamma_ev=gamma_ev)
+        t = self._tensor_on_wmesh(wmesh, gamma_ev, units)
 
         if qdirs is None:
             qdirs = np.eye(3)
@@ -2854,20 +2887,30 @@ class DdbRobot(Robot):
         if any(not s.startswith("mp-") for s in mpid_list):
             raise ValueError(f"Invalid mp-in in list:\n{mpid_list}")
 
-        with restapi.get_mprester(api_key=api_key, endpoint=endpoint) as rest:
-            for mpid in mpid_list:
+        def get_ddb_string(mpid):
+            # Each thread uses its own rester.
+            with restapi.get_mprester(api_key=api_key, endpoint=endpoint) as rest:
                 try:
-                    ddb_string = rest._make_request("/materials/%s/abinit_ddb" % mpid)
+                    return rest._make_request("/materials/%s/abinit_ddb" % mpid)
                 except rest.Error:
                     cprint("Cannot get DDB for mp-id: %s, ignoring error" % mpid, "yellow")
-                    continue
+                    return None
 
-                _, tmpfile = tempfile.mkstemp(prefix=mpid, suffix='_DDB')
-                ddb_files.append(tmpfile)
-                with open(tmpfile, "wt") as fh:
-                    fh.write(ddb_string)
+        # Downloads are IO-bound so we can use threads.
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(8, len(mpid_list))) as executor:
+            ddb_strings = list(executor.map(get_ddb_string, mpid_list))
 
-        return cls.from_files(ddb_files, labels=mpid_list)
+        labels = []
+        for mpid, ddb_string in zip(mpid_list, ddb_strings):
+            if ddb_string is None: continue
+            _, tmpfile = tempfile.mkstemp(prefix=mpid, suffix='_DDB')
+            ddb_files.append(tmpfile)
+            labels.append(mpid)
+            with open(tmpfile, "wt") as fh:
+                fh.write(ddb_string)
+
+        return cls.from_files(ddb_files, labels=labels)
 
     #def get_qpoints_union(self):
     #    """
@@ -3011,13 +3054,15 @@ class DdbRobot(Robot):
         row_names = row_names if not abspath else self._to_relpaths(row_names)
         return pd.DataFrame(rows, index=row_names, columns=list(rows[0].keys()))
 
-    def anaget_phonon_plotters(self, **kwargs):
+    def anaget_phonon_plotters(self, num_cpus=1, **kwargs):
         r"""
         Invoke anaddb to compute phonon bands and DOS using the arguments passed via `kwargs`.
         Collect results and return `namedtuple` with the following attributes:
 
             phbands_plotter: |PhononBandsPlotter| object.
             phdos_plotter: |PhononDosPlotter| object.
+
+        num_cpus: Number of threads used to execute the anaddb calculations for the different DDB files concurrently.
         """
         if "workdir" in kwargs:
             raise ValueError("Cannot specify `workdir` when multiple DDB file are executed.")
@@ -3030,9 +3075,7 @@ class DdbRobot(Robot):
                 raise RuntimeError("Cannot find `anaddb.nc` in directory %s" % (directory))
             return p
 
-        phbands_plotter, phdos_plotter = PhononBandsPlotter(), PhononDosPlotter()
-
-        for label, ddb in self.items():
+        def do_work(ddb):
             # Invoke anaddb to get phonon bands and DOS.
             phbst_file, phdos_file = ddb.anaget_phbst_and_phdos_files(**kwargs)
 
@@ -3045,6 +3088,21 @@ class DdbRobot(Robot):
                 anaddb_path = find_anaddb_ncpath(phbst_file.filepath)
                 phbst_file.phbands.read_non_anal_from_file(anaddb_path)
 
+            return phbst_file, phdos_file
+
+        # Each anaddb run uses its own workdir so the calculations can be executed concurrently.
+        labels, ddbs = list(self.keys()), list(self.abifiles)
+        num_cpus = max(1, min(num_cpus, len(ddbs)))
+        if num_cpus == 1:
+            results = list(map(do_work, ddbs))
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=num_cpus) as executor:
+                results = list(executor.map(do_work, ddbs))
+
+        # Fill the plotters in the main thread to preserve the order of the DDB files.
+        phbands_plotter, phdos_plotter = PhononBandsPlotter(), PhononDosPlotter()
+        for label, (phbst_file, phdos_file) in zip(labels, results):
             phbands_plotter.add_phbands(label, phbst_file, phdos=phdos_file)
             phbst_file.close()
             if phdos_file is not None:
@@ -640,7 +640,6 @@ _atom_site_aniso_U_12""".splitlines()
         msq = self.get_msq_tmesh(tmesh, iatom_list=aview.iatom_list, what_list=what)
         # [natom, 3, 3, nt]
         values = getattr(msq, what)
-        ntemp = len(msq.tmesh)
 
         for ix, ax in enumerate(ax_list):
             ax.grid(True)
@@ -666,10 +665,9 @@ _atom_site_aniso_U_12""".splitlines()
                 elif ix == 1:
                     # Ratio between maximum Uii and minimum Uii values.
                     # A ratio of 1 would correspond to an isotropic displacement.
-                    ys = np.empty(ntemp)
-                    for itemp in range(ntemp):
-                        eigs = np.linalg.eigvalsh(values[iatom, :, :, itemp], UPLO='U')
-                        ys[itemp] = eigs.max() / eigs.min()
+                    # Diagonalize the tensors for all temperatures at once. Eigenvalues are in ascending order.
+                    eigs = np.linalg.eigvalsh(np.moveaxis(values[iatom], -1, 0), UPLO='U')
+                    ys = eigs[:, -1] / eigs[:, 0]
                 else:
                     raise ValueError("Invalid ix index: `%s" % ix)
 
@@ -24,7 +24,7 @@ from abipy.core.structure import Structure
 from abipy.abio.robots import Robot
 from abipy.iotools import ETSF_Reader
 from abipy.tools import duck
-from abipy.tools.numtools import gaussian, sort_and_groupby
+from abipy.tools.numtools import sort_and_groupby
 from abipy.tools.plotting import add_fig_kwargs, get_ax_fig_plt, set_axlims, get_axarray_fig_plt, set_visible,\
     set_ax_xylabels, get_figs_plotly, get_fig_plotly, add_plotly_fig_kwargs, plotlyfigs_to_browser,\
     push_to_chart_studio, PlotlyRowColDesc, plotly_klabels, plotly_set_xylabels, plotly_set_lims
@@ -654,9 +654,9 @@ class PhononBands(object):
         Compute the phonon DOS on a linear mesh.
 
         Args:
-            method: String defining the method
+            method: String defining the method: "gaussian" or "histogram".
             step: Energy step (eV) of the linear mesh.
-            width: Standard deviation (eV) of the gaussian.
+            width: Standard deviation (eV) of the gaussian. Not used if method == "histogram".
 
         Returns:
             |PhononDos| object.
@@ -673,17 +673,28 @@ class PhononBands(object):
         w_min -= 0.1 * abs(w_min)
         w_max = self.maxfreq
         w_max += 0.1 * abs(w_max)
-        nw = 1 + (w_max - w_min) / step
+        nw = int(1 + (w_max - w_min) / step)
 
         mesh, step = np.linspace(w_min, w_max, num=nw, endpoint=True, retstep=True)
 
         values = np.zeros(nw)
         if method == "gaussian":
-            for q, qpoint in enumerate(self.qpoints):
-                weight = qpoint.weight
-                for nu in self.branches:
-                    w = self.phfreqs[q, nu]
-                    values += weight * gaussian(mesh, width, center=w)
+            # Broaden all the (q, nu) frequencies at once, in blocks of q-points to limit memory.
+            weights = self.qpoints.weights
+            norm = 1.0 / (width * np.sqrt(2 * np.pi))
+            qblock = max(1, 2**22 // (self.num_branches * nw))
+            for q0 in range(0, self.nqpt, qblock):
+                freqs = self.phfreqs[q0:q0+qblock]
+                x = (mesh[None, None, :] - freqs[:, :, None]) / width
+                values += np.einsum("q,qnw->w", weights[q0:q0+qblock], np.exp(-0.5 * x**2))
+            values *= norm
+
+        elif method == "histogram":
+            # Bins are centered on the points of the mesh.
+            weights = np.broadcast_to(self.qpoints.weights[:, None], self.phfreqs.shape)
+            edges = np.append(mesh - 0.5 * step, mesh[-1] + 0.5 * step)
+            values, _ = np.histogram(self.phfreqs.ravel(), bins=edges, weights=weights.ravel())
+            values /= step
 
         else:
             raise ValueError("Method %s is not supported" % str(method))
@@ -766,10 +777,9 @@ class PhononBands(object):
         for iqpt in iqpts:
             q = self.qpoints[iqpt].frac_coords
 
-            displ_list = np.zeros((self.num_branches, self.num_atoms, 3), dtype=complex)
-            for i in range(self.num_atoms):
-                displ_list[:,i,:] = self.phdispl_cart[iqpt,:,3*i:3*(i+1)] * \
-                    np.exp(-2*np.pi*1j*np.dot(structure[i].frac_coords, self.qpoints[iqpt].frac_coords))
+            phases = np.exp(-2*np.pi*1j*np.dot(structure.frac_coords, self.qpoints[iqpt].frac_coords))
+            displ_list = np.reshape(self.phdispl_cart[iqpt], (self.num_branches, self.num_atoms, 3)) * \
+                phases[None, :, None]
 
             displ_list = np.dot(np.dot(displ_list, structure.lattice.inv_matrix), ascii_basis) * pre_factor
 
@@ -1205,11 +1215,12 @@ See also <https://forum.abinit.org/viewtopic.php?f=10&t=545>
         return lines
 
     def plotly_traces(self, fig, branch, rcd=None, units='eV', name='', match_bands=False,
-                      showlegend=False, **kwargs):
+                      showlegend=False, webgl=False, **kwargs):
         """
         Plots the frequencies for the given branches indices as a function of the q-index on figure ``fig`` .
         If ``fig`` has subplots, ``rcd`` is used to add traces on these subplots.
         If ``branch`` is None, all phonon branches are plotted.
+        If ``webgl``, the lines are rendered with WebGL (Scattergl) that is faster for large datasets.
         kwargs: Passed to fig.add_scatter method.
         """
         linecolor = kwargs.pop("color", "black")
@@ -1227,18 +1238,29 @@ See also <https://forum.abinit.org/viewtopic.php?f=10&t=545>
 
         first_xx = 0
         factor = abu.phfactor_ev2units(units)
+        branch_range = list(branch_range)
+        if not branch_range: return
 
+        # All the branches share the same style so we build a single trace in which
+        # lines are separated by NaNs. This is much faster than one trace per branch.
+        xs, ys = [], []
         for i, pf in enumerate(self.split_phfreqs):
             if match_bands:
                 ind = self.split_matched_indices[i]
                 pf = pf[np.arange(len(pf))[:, None], ind]
-            pf = pf * factor
-            xx = list(range(first_xx, first_xx + len(pf)))
-            for branch in branch_range:
-                fig.add_scatter(x=xx, y=pf[:, branch], mode='lines', name=name, legendgroup=name, showlegend=False,
-                                   line=dict(color=linecolor, width=linewidth), **kwargs, row=ply_row, col=ply_col)
+            xx = np.arange(first_xx, first_xx + len(pf), dtype=float)
+            # Shape: (nbranch, nq + 1) with NaN in the last column.
+            yy = np.full((len(branch_range), len(pf) + 1), np.nan)
+            yy[:, :-1] = pf[:, branch_range].T * factor
+            xs.append(np.tile(np.append(xx, np.nan), len(branch_range)))
+            ys.append(yy.ravel())
             first_xx = xx[-1]
 
+        add_trace = fig.add_scattergl if webgl else fig.add_scatter
+        add_trace(x=np.concatenate(xs), y=np.concatenate(ys), mode='lines', connectgaps=False,
+                  name=name, legendgroup=name, showlegend=False,
+                  line=dict(color=linecolor, width=linewidth), **kwargs, row=ply_row, col=ply_col)
+
         if showlegend:
             fig.data[-1].showlegend = True
 
@@ -1913,7 +1935,7 @@ See also <https://forum.abinit.org/viewtopic.php?f=10&t=545>
 
     @add_plotly_fig_kwargs
     def plotly_with_phdos(self, phdos, units="eV", qlabels=None, fig=None, rcd_phbands=None, rcd_phdos=None,
-                          width_ratios=(2, 1), fontsize=12, **kwargs):
+                          width_ratios=(2, 1), fontsize=12, max_points=None, **kwargs):
         r"""
         Plot the phonon band structure with the phonon DOS with plotly.
 
@@ -1928,6 +1950,7 @@ See also <https://forum.abinit.org/viewtopic.php?f=10&t=545>
             width_ratios: Ratio between the width of the bands plots and the DOS plots.
                 Used if ``fig`` is None
             fontsize: Title fontsize.
+            max_points: If not None, the DOS is downsampled to max_points points with the LTTB algorithm.
 
         Returns: |plotly.graph_objects.Figure|
         """
@@ -1961,7 +1984,8 @@ See also <https://forum.abinit.org/viewtopic.php?f=10&t=545>
         else:
             rcd_phdos = PlotlyRowColDesc(0, 1, 1, 2)
 
-        phdos.plotly_dos_idos(fig, rcd=rcd_phdos, what="d", units=units, exchange_xy=True, showlegend=False, **kwargs)
+        phdos.plotly_dos_idos(fig, rcd=rcd_phdos, what="d", units=units, exchange_xy=True, showlegend=False,
+                              max_points=max_points, **kwargs)
         fig.update_layout(font_size=fontsize)
 
         return fig
@@ -4107,9 +4131,23 @@ class PhononBandsPlotter(NotebookWriter):
 
     def append_plotter(self, other):
         """Append phbands and phdos from other plotter to self."""
-        for label, phbands in other._bands_dict.items():
-            phdos = self._phdoses_dict.get(label, None)
-            self.add_phbands(label, phbands, phdos=phdos)
+        self.extend([other])
+
+    def extend(self, plotters):
+        """
+        Append phbands and phdos from a sequence of plotters to self.
+        The internal dictionaries are updated in a single pass.
+        """
+        bands_dict, phdoses_dict = {}, {}
+        for other in plotters:
+            dups = [label for label in other._bands_dict if label in self._bands_dict or label in bands_dict]
+            if dups:
+                raise ValueError("labels %s are already in %s" % (dups, list(self._bands_dict.keys()) + list(bands_dict.keys())))
+            bands_dict.update(other._bands_dict)
+            phdoses_dict.update(other._phdoses_dict)
+
+        self._bands_dict.update(bands_dict)
+        self._phdoses_dict.update(phdoses_dict)
 
     def add_plotter(self, other):
         """Merge two plotters, return new plotter."""
@@ -4292,7 +4330,7 @@ class PhononBandsPlotter(NotebookWriter):
 
     @add_plotly_fig_kwargs
     def combiplotly(self, qlabels=None, units='eV', ylims=None, width_ratios=(2, 1), fontsize=12,
-                  linestyle_dict=None, **kwargs):
+                  linestyle_dict=None, webgl=False, **kwargs):
         r"""
         Plot the band structure and the DOS on the same figure with plotly.
         Use ``gridplotply`` to plot band structures on different figures.
@@ -4307,6 +4345,7 @@ class PhononBandsPlotter(NotebookWriter):
                 Used if plotter has DOSes.
             fontsize: fontsize for titles and legend.
             linestyle_dict: Dictionary mapping labels to linestyle options passed to |plotly.graph_objects.scatter|.
+            webgl: True to render the phonon bands with WebGL. Recommended when comparing many band structures.
 
         Returns: |plotly.graph_objects.Figure|
         """
@@ -4339,7 +4378,8 @@ class PhononBandsPlotter(NotebookWriter):
             if os.path.isfile(label): label = os.path.relpath(label)
 
             rcd = PlotlyRowColDesc(0, 0, nrows, ncols)
-            phbands.plotly_traces(fig, branch=None, rcd=rcd, units=units, name=label, showlegend=True, **my_kwargs)
+            phbands.plotly_traces(fig, branch=None, rcd=rcd, units=units, name=label, showlegend=True,
+                                  webgl=webgl, **my_kwargs)
 
             # Set ticks and labels, legends.
             if i == 0:
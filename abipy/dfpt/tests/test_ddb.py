@@ -354,6 +354,12 @@ class DdbTest(AbipyTest):
                     nqsmall=0, ndivsm=5, dos_method="gaussian", ngqpt=None, verbose=2)
                 assert plotter.gridplot(show=False)
 
+                asr_plotter, dipdip_plotter = ddb.anacompare_asr_dipdip(asr_list=(0, 2), chneut_list=(1,),
+                    nqsmall=0, ndivsm=5, ngqpt=None, num_cpus=2, verbose=2)
+                assert len(asr_plotter.phbands_list) == len(dipdip_plotter.phbands_list) == 2
+                # The (asr=2, chneut=1, dipdip=1) calculation is shared by the two plotters.
+                assert asr_plotter.phbands_list[-1] is dipdip_plotter.phbands_list[-1]
+
     def test_mgb2_ddbs_ngkpt_tsmear(self):
         """Testing multiple DDB files and gridplot_with_hue."""
         paths = [
@@ -500,8 +506,14 @@ class DielectricTensorGeneratorTest(AbipyTest):
         df = d.get_oscillator_dataframe(reim="all", tol=1e-8)
         df = d.get_oscillator_dataframe(reim="im", tol=1e-8)
         df = d.get_oscillator_dataframe(reim="re", tol=1e-8)
+        assert df.shape == (3 * len(d.structure), 6) and df.index.name == "mode"
+        self.assert_almost_equal(df["xy"].values, np.where(np.abs(d.oscillator_strength[:, 0, 1].real) > 1e-8,
+                                                           d.oscillator_strength[:, 0, 1].real, 0))
 
         self.assertAlmostEqual(d.tensor_at_frequency(0.001, units='Ha', gamma_ev=0.0)[0, 0], 11.917178540635028)
+        wmesh = [0.0, 0.001, 0.01]
+        self.assert_almost_equal(d._tensor_on_wmesh(wmesh, 1e-3, "Ha"),
+                                 [d.tensor_at_frequency(w, units="Ha", gamma_ev=1e-3) for w in wmesh])
 
         d = DielectricTensorGenerator.from_objects(PhononBands.from_file(phbstnc_fname),
                                                    AnaddbNcFile.from_file(anaddbnc_fname))
@@ -518,6 +530,12 @@ class DielectricTensorGeneratorTest(AbipyTest):
             assert d.plot_e0w_qdirs(show=False)
             assert d.plot_reflectivity(show=False)
 
+        if self.has_plotly():
+            for comp in ["diag", "offdiag", "all", "diag_av", (0, 1)]:
+                assert d.plotly(num=10, component=comp, units="cm-1", show=False)
+            fig = d.plotly(num=2000, component="diag", reim="re", max_points=100, show=False)
+            assert len(fig.data[0].x) == 100
+
 
 class DdbRobotTest(AbipyTest):
 
@@ -135,6 +135,24 @@ class PhononBandsTest(AbipyTest):
         with self.assertRaises(ValueError):
             phdos = phbands.get_phdos()
 
+        # Fake a homogeneous sampling and compare with the direct sum over (q, nu).
+        from abipy.tools.numtools import gaussian
+        old_weights = phbands.qpoints.weights
+        for qpoint in phbands.qpoints:
+            qpoint.set_weight(1.0 / phbands.nqpt)
+        phdos = phbands.get_phdos(step=1e-4, width=4e-4)
+        ref = np.zeros(len(phdos.mesh))
+        for iq, qpoint in enumerate(phbands.qpoints):
+            for nu in phbands.branches:
+                ref += qpoint.weight * gaussian(phdos.mesh, 4e-4, center=phbands.phfreqs[iq, nu])
+        self.assert_almost_equal(phdos.values, ref)
+        hist_dos = phbands.get_phdos(method="histogram", step=1e-4)
+        self.assert_almost_equal(hist_dos.mesh, phdos.mesh)
+        self.assert_almost_equal(hist_dos.values.sum() * (hist_dos.mesh[1] - hist_dos.mesh[0]),
+                                 3 * len(phbands.structure))
+        for qpoint, w in zip(phbands.qpoints, old_weights):
+            qpoint.set_weight(w)
+
         # convert to pymatgen object and check that the opposite converted is consistent
         pmg_bands = phbands.to_pymatgen()
         phbands_from_pmg = PhononBands.from_pmg_bs(pmg_bands)
@@ -293,6 +311,15 @@ class PhononBandsPlotterTest(AbipyTest):
         assert len(p2.phbands_list) == 2
         assert len(p2.phdoses_list) == 2
 
+        # extend appends the bands and the DOSes of a sequence of plotters.
+        p3 = PhononBandsPlotter()
+        p3.extend([PhononBandsPlotter(key_phbands=[(k, v)], key_phdos=[(k, d)])
+                   for (k, v), d in zip(plotter.phbands_dict.items(), plotter.phdoses_list)])
+        assert list(p3.phbands_dict.keys()) == ["AlAs", "Same-AlAs"]
+        assert len(p3.phdoses_list) == 2
+        with self.assertRaises(ValueError):
+            p3.extend([plotter])
+
         df = dataframe_from_phbands(plotter.phbands_list)
         assert "nqpt" in df
 
@@ -308,6 +335,8 @@ class PhononBandsPlotterTest(AbipyTest):
 
         if self.has_matplotlib():
             assert plotter.combiplotly(units="eV", show=False)
+            fig = plotter.combiplotly(webgl=True, show=False)
+            assert fig.data[0].type == "scattergl"
             assert plotter.gridplotly(units="meV", show=False)
 
         if self.has_nbformat():
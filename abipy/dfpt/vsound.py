@@ -166,15 +166,11 @@ class SoundVelocity(Has_Structure, NotebookWriter):
 
         rlatt = structure.lattice.reciprocal_lattice
         # q points in cartesian coordinate in 1/bohr, the original units are 1/A
-        qpt_cart_coords = [rlatt.get_cartesian_coords(c) * bohr_to_angstrom for c in
-                           phb.qpoints.frac_coords]
+        qpt_cart_coords = rlatt.get_cartesian_coords(phb.qpoints.frac_coords) * bohr_to_angstrom
         qpt_cart_norms = np.linalg.norm(qpt_cart_coords, axis=1)
 
         # find the indices of the gamma points
-        gamma_ind = []
-        for i, q in enumerate(phb.qpoints.frac_coords):
-            if np.array_equal(q, [0,0,0]):
-                gamma_ind.append(i)
+        gamma_ind = np.flatnonzero(np.all(phb.qpoints.frac_coords == 0, axis=1))
 
         n_directions = len(gamma_ind)
 
@@ -220,11 +216,8 @@ class SoundVelocity(Has_Structure, NotebookWriter):
             directions.append(direction)
 
             # identify the first (not gamma) qpoint with all positive frequencies
-            first_positive_freq_ind = None
-            for j in range(1, n_points):
-                if min(acoustic_freqs[j]) > 0:
-                    first_positive_freq_ind = j
-                    break
+            positive_inds = np.flatnonzero(acoustic_freqs[1:].min(axis=1) > 0)
+            first_positive_freq_ind = positive_inds[0] + 1 if len(positive_inds) else None
 
             if first_positive_freq_ind is None or first_positive_freq_ind - n_points / 2 > 0:
                 raise ValueError("Too many negative frequencies along direction {}".format(direction))
@@ -233,13 +226,16 @@ class SoundVelocity(Has_Structure, NotebookWriter):
             mt = []
 
             cart_versor = qpt_cart_coords[end - 1] / np.linalg.norm(qpt_cart_coords[end - 1])
+            start_fit = 0
+            if ignore_neg_freqs and first_positive_freq_ind > 1:
+                start_fit = first_positive_freq_ind
+
+            # Fit the three acoustic branches with a single least-squares call (one column per branch).
+            slopes, _, _, _ = np.linalg.lstsq(qpt_cart_norms[start+start_fit:end][:, np.newaxis],
+                                              acoustic_freqs[start_fit:, :] * eV_to_Ha, rcond=None)
+
             for k in range(3):
-                start_fit = 0
-                if ignore_neg_freqs and first_positive_freq_ind > 1:
-                    start_fit = first_positive_freq_ind
-                slope, se, _, _ = np.linalg.lstsq(qpt_cart_norms[start+start_fit:end][:, np.newaxis],
-                                                  acoustic_freqs[start_fit:, k] * eV_to_Ha, rcond=None)
-                sv.append(slope[0] * abu.velocity_at_to_si)
+                sv.append(slopes[0, k] * abu.velocity_at_to_si)
 
                 # identify the type of the mode (longitudinal/transversal) based on the
                 # scalar product between the eigendisplacement and the direction.
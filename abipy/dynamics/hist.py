@@ -79,7 +79,7 @@ class HistFile(AbinitNcFile, NotebookWriter):
     @lazy_property
     def final_pressure(self):
         """Final pressure in Gpa."""
-        cart_stress_tensors, pressures = self.reader.read_cart_stress_tensors()
+        cart_stress_tensors, pressures = self.cart_stress_tensors_and_pressures
         return pressures[-1]
 
     #@lazy_property
@@ -124,7 +124,7 @@ class HistFile(AbinitNcFile, NotebookWriter):
         #an.get_percentage_bond_dist_changes(max_radius=3.0)
         app("")
 
-        cart_stress_tensors, pressures = self.reader.read_cart_stress_tensors()
+        cart_stress_tensors, pressures = self.cart_stress_tensors_and_pressures
         app("Stress tensor (Cartesian coordinates in GPa):\n%s" % cart_stress_tensors[-1])
         app("Pressure: %.3f [GPa]" % pressures[-1])
 
@@ -160,6 +160,24 @@ class HistFile(AbinitNcFile, NotebookWriter):
         """|numpy-array| with total energies in eV at the different steps."""
         return self.reader.read_eterms().etotals
 
+    @lazy_property
+    def cart_stress_tensors_and_pressures(self):
+        """
+        Tuple with the stress tensors (num_steps x 3 x 3) in cartesian coordinates (GPa)
+        and the pressures in GPa at the different steps.
+        """
+        return self.reader.read_cart_stress_tensors()
+
+    @lazy_property
+    def fstats_steps(self):
+        """
+        |AttrDict| with the min, max, mean and std of the modulus of the cartesian forces (eV/A)
+        at the different steps. Each entry is a |numpy-array| of shape (num_steps,).
+        """
+        fmods = np.linalg.norm(self.reader.read_cart_forces(), axis=-1)
+        return AttrDict(fmin=fmods.min(axis=1), fmax=fmods.max(axis=1),
+                        fmean=fmods.mean(axis=1), fstd=fmods.std(axis=1))
+
     def get_relaxation_analyzer(self):
         """
         Return a pymatgen :class:`RelaxationAnalyzer` object to analyze the relaxation in a calculation.
@@ -341,22 +359,15 @@ class HistFile(AbinitNcFile, NotebookWriter):
             ax.set_ylabel(r'$V\, (A^3)$')
 
         elif what == "pressure":
-            stress_cart_tensors, pressures = self.reader.read_cart_stress_tensors()
+            stress_cart_tensors, pressures = self.cart_stress_tensors_and_pressures
             marker = kwargs.pop("marker", "o")
             label = kwargs.pop("label", "P")
             ax.plot(self.steps, pressures, label=label, marker=marker, **kwargs)
             ax.set_ylabel('P (GPa)')
 
         elif what == "forces":
-            forces_hist = self.reader.read_cart_forces()
-            fmin_steps, fmax_steps, fmean_steps, fstd_steps = [], [], [], []
-            for step in range(self.num_steps):
-                forces = forces_hist[step]
-                fmods = np.sqrt([np.dot(force, force) for force in forces])
-                fmean_steps.append(fmods.mean())
-                fstd_steps.append(fmods.std())
-                fmin_steps.append(fmods.min())
-                fmax_steps.append(fmods.max())
+            fstats = self.fstats_steps
+            fmin_steps, fmax_steps, fmean_steps, fstd_steps = fstats.fmin, fstats.fmax, fstats.fmean, fstats.fstd
 
             mark = kwargs.pop("marker", None)
             markers = ["o", "^", "v", "X"] if mark is None else 4 * [mark]
@@ -444,7 +455,7 @@ class HistFile(AbinitNcFile, NotebookWriter):
             fig.layout['yaxis%u' % rcd.iax].title.text = 'V (A³)'
 
         elif what == "pressure":
-            stress_cart_tensors, pressures = self.reader.read_cart_stress_tensors()
+            stress_cart_tensors, pressures = self.cart_stress_tensors_and_pressures
             marker = kwargs.pop("marker", 0)
             label = kwargs.pop("label", "P")
             fig.add_scatter(x=self.steps, y=pressures, mode='lines+markers',
@@ -452,15 +463,8 @@ class HistFile(AbinitNcFile, NotebookWriter):
             fig.layout['yaxis%u' % rcd.iax].title.text = 'P (GPa)'
 
         elif what == "forces":
-            forces_hist = self.reader.read_cart_forces()
-            fmin_steps, fmax_steps, fmean_steps, fstd_steps = [], [], [], []
-            for step in range(self.num_steps):
-                forces = forces_hist[step]
-                fmods = np.sqrt([np.dot(force, force) for force in forces])
-                fmean_steps.append(fmods.mean())
-                fstd_steps.append(fmods.std())
-                fmin_steps.append(fmods.min())
-                fmax_steps.append(fmods.max())
+            fstats = self.fstats_steps
+            fmin_steps, fmax_steps, fmean_steps, fstd_steps = fstats.fmin, fstats.fmax, fstats.fmean, fstats.fstd
 
             mark = kwargs.pop("marker", None)
             markers = [0, 5, 6, 4] if mark is None else 4 * [mark]
@@ -52,6 +52,15 @@ class HistFileTest(AbipyTest):
         self.assert_almost_equal(cart_stress_tensors[-1, 1, 0], 0.0)
         for i in range(3):
             self.assert_almost_equal(cart_stress_tensors[-1, i, i], 5.01170783E-08 * abu.HaBohr3_GPa)
+        assert hist.cart_stress_tensors_and_pressures is hist.cart_stress_tensors_and_pressures
+        self.assert_almost_equal(hist.cart_stress_tensors_and_pressures[1], pressures)
+
+        fstats = hist.fstats_steps
+        assert len(fstats.fmax) == hist.num_steps
+        for step in (0, hist.num_steps - 1):
+            d = hist.get_fstats_dict(step)
+            for k in ("fmin", "fmax", "fmean", "fstd"):
+                self.assert_almost_equal(fstats[k][step], d[k])
 
         same_structure = abilab.Structure.from_file(abidata.ref_file("sic_relax_HIST.nc"))
         self.assert_almost_equal(same_structure.frac_coords, hist.final_structure.frac_coords)
@@ -2382,6 +2382,15 @@ class ElectronBands(Has_Structure):
         xx, lines = np.arange(self.nkpt), []
         e0 = self.get_e0(e0)
         for spin in spin_range:
+            if not with_linewidths:
+                # Plot all the bands with a single call. Each column gives a line.
+                spin_lines = ax.plot(xx, self.eigens[spin][:, band_range] - e0, **kwargs)
+                # Set label only for the first line
+                if label is not None: spin_lines[0].set_label(label)
+                lines.extend(spin_lines)
+                label = None
+                continue
+
             for band in band_range:
                 yy = self.eigens[spin, :, band] - e0
 
@@ -2389,11 +2398,10 @@ class ElectronBands(Has_Structure):
                 lines.extend(ax.plot(xx, yy, label=label, **kwargs))
                 label = None
 
-                if with_linewidths:
-                    w = self.linewidths[spin, :, band] * lw_fact / 2
-                    lw_color = lines[-1].get_color()
-                    ax.fill_between(xx, yy - w, yy + w, facecolor=lw_color, **lw_opts)
-                    #, alpha=self.alpha, facecolor=self.l2color[l])
+                w = self.linewidths[spin, :, band] * lw_fact / 2
+                lw_color = lines[-1].get_color()
+                ax.fill_between(xx, yy - w, yy + w, facecolor=lw_color, **lw_opts)
+                #, alpha=self.alpha, facecolor=self.l2color[l])
 
         return lines
 
@@ -41,6 +41,8 @@ class LdauParams(object):
 
         print(luj_params.to_abivars())
     """
+    __slots__ = ["usepawu", "structure", "_params"]
+
     def __init__(self, usepawu, structure):
         """
         Arg:
@@ -114,6 +116,8 @@ class LexxParams(object):
 
         print(lexc_params.to_abivars())
     """
+    __slots__ = ["structure", "_lexx_for_symbol"]
+
     def __init__(self, structure):
         """
         Arg:
@@ -1,4 +1,5 @@
 """Tests for flowtk.abiobjects module."""
+import copy
 import numpy as np
 import abipy.data as abidata
 
@@ -21,6 +22,8 @@ class LdauLexxTest(AbipyTest):
         avars = luj_params.to_abivars()
 
         self.serialize_with_pickle(luj_params, test_eq=False)
+        assert not hasattr(luj_params, "__dict__")
+        assert copy.deepcopy(luj_params).to_abivars() == avars
 
         atrue(avars["usepawu"] == 1)
         aequal(avars["lpawu"], "2 -1"),
@@ -40,6 +43,7 @@ class LdauLexxTest(AbipyTest):
         avars = lexx_params.to_abivars()
 
         self.serialize_with_pickle(lexx_params, test_eq=False)
+        assert not hasattr(lexx_params, "__dict__")
 
         aequal(avars["useexexch"], 1),
         aequal(avars["lexexch"], "2 -1")
@@ -1,6 +1,7 @@
 """"Basic tools and mixin classes for AbiPy panels."""
 
 import io
+import weakref
 import tempfile
 import numpy as np
 import param
@@ -172,6 +173,103 @@ def show_exception(func):
     return decorated
 
 
+async def run_in_thread(func, *args, **kwargs):
+    """
+    Execute func(*args, **kwargs) in a separate thread so that the event loop is not blocked
+    e.g. while we are fetching data from the Materials Project website.
+    Same as asyncio.to_thread that is not available in py < 3.9.
+    """
+    import asyncio
+    from functools import partial
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+
+# Max number of lines of the summary shown by default. See summary_row.
+_SUMMARY_MAX_LINES = 50
+
+# String representation of the objects shown in the Summary tab: obj --> {verbose: text}.
+# Entries are removed when the object is garbage collected. See summary_row.
+_SUMMARY_CACHE = weakref.WeakKeyDictionary()
+
+
+def summary_row(obj, verbose):
+    """
+    Return Column with the string representation of obj.
+    If the app is being served, the text is computed once the page has been loaded so that
+    the initial rendering is not blocked by large objects. The text is cached in _SUMMARY_CACHE
+    so that it is shared by all the panels built from the same object.
+    Only the first _SUMMARY_MAX_LINES lines are shown. The full text is sent to the browser
+    only when the user opens the accordion.
+    """
+    pretext = bkw.PreText(text="Loading ...", sizing_mode="scale_both")
+    col = pn.Column(pretext, sizing_mode="stretch_width")
+    cache = _SUMMARY_CACHE.setdefault(obj, {})
+
+    def fill_text():
+        if verbose not in cache:
+            cache[verbose] = obj.to_string(verbose=verbose)
+        text = cache[verbose]
+        lines = text.splitlines()
+        if len(lines) <= _SUMMARY_MAX_LINES:
+            pretext.text = text
+            return
+
+        pretext.text = "\n".join(lines[:_SUMMARY_MAX_LINES])
+        full_pretext = bkw.PreText(text="", sizing_mode="scale_both")
+        acc = pn.Accordion(("Full summary (%d lines)" % len(lines), full_pretext), sizing_mode="stretch_width")
+
+        def on_active(event):
+            if event.new and not full_pretext.text: full_pretext.text = text
+
+        acc.param.watch(on_active, "active")
+        col.append(acc)
+
+    if verbose in cache or pn.state.loaded:
+        fill_text()
+    else:
+        pn.state.onload(fill_text)
+
+    return col
+
+
+def lazy_tabs(d, **kwargs):
+    """
+    Build panel Tabs from a dictionary mapping the title of the tab to its content.
+    Values can be panel objects or callables returning the object. In the latter case,
+    the object is built only when the tab is activated for the first time.
+    Tabs are dynamic so that only the active tab is rendered in the browser.
+    kwargs are passed to pn.Tabs.
+    """
+    # Placeholders are identified by identity and not by position as closable tabs can be removed.
+    pending, items = [], []
+    for i, (title, obj) in enumerate(d.items()):
+        if callable(obj) and not isinstance(obj, pn.viewable.Viewable):
+            if i == 0:
+                obj = obj()
+            else:
+                placeholder = pn.Column("Loading ...", sizing_mode="stretch_width")
+                pending.append((placeholder, title, obj))
+                obj = placeholder
+        items.append((title, obj))
+
+    kwargs.setdefault("dynamic", True)
+    tabs = pn.Tabs(*items, **kwargs)
+
+    def on_active(event):
+        i = event.new
+        if i is None or not 0 <= i < len(tabs): return
+        for j, (placeholder, title, builder) in enumerate(pending):
+            if tabs[i] is placeholder:
+                del pending[j]
+                tabs[i] = (title, builder())
+                break
+
+    if pending: tabs.param.watch(on_active, "active")
+
+    return tabs
+
+
 class HTMLwithClipboardBtn(pn.pane.HTML):
     """
     Receives an HTML string and returns an HTML pane with a button that allows the user
@@ -310,6 +408,9 @@ def dfc(df,
         if "auto_edit" not in kwargs: kwargs["auto_edit"] = False
         w = pnw.DataFrame(df, **kwargs)
     elif wdg_type == "tabulator":
+        # Send only the rows in the visible page to the browser.
+        if "pagination" not in kwargs: kwargs["pagination"] = "remote"
+        if "page_size" not in kwargs: kwargs["page_size"] = 20
         w = pnw.Tabulator(df, **kwargs)
     else:
         raise ValueError(f"Don't know how to handle widget type: `{wdg_type}`")
@@ -725,8 +826,7 @@ Also, use `.abi` for ABINIT input files and `.abo` for the main output file.
         include them in a template and return the template.
         """
         if isinstance(tabs, dict):
-            tabs = pn.Tabs(*tabs.items(), tabs_location=tabs_location, closable=closable,
-                           sizing_mode="stretch_width")
+            tabs = lazy_tabs(tabs, tabs_location=tabs_location, closable=closable, sizing_mode="stretch_width")
 
         if template is None:
             return tabs
@@ -1,14 +1,177 @@
 """"Panels for DDB files."""
-import sys
+import os
+import glob
+import pickle
+import tempfile
+import hashlib
+import types
+import functools
+import threading
+import warnings
+
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
 import param
+import numpy as np
+import pandas as pd
 import panel as pn
 import panel.widgets as pnw
 import bokeh.models.widgets as bkw
 
 from abipy.core.structure import Structure
 from abipy.panels.core import (AbipyParameterized, PanelWithStructure, BaseRobotPanel,
-        mpl, ply, dfc, depends_on_btn_click, Loading, ActiveBar)
-from abipy.dfpt.ddb import PhononBandsPlotter
+        mpl, ply, dfc, depends_on_btn_click, Loading, ActiveBar, run_in_thread, summary_row)
+from abipy.dfpt.phonons import PhononBandsPlotter, PhdosFile
+
+
+# Max number of anaddb results stored in pn.state.cache. See _anaddb_cached.
+_ANADDB_CACHE_MAXSIZE = 64
+
+# Keys of the anaddb results in pn.state.cache from the oldest to the most recently used.
+# The list is shared by the sessions running in different threads so it's protected by a lock.
+_ANADDB_CACHE_KEYS = []
+_ANADDB_CACHE_LOCK = threading.Lock()
+
+# HTML representation of the anaddb inputs returned by _cached_call: id(input) --> (input, html).
+# The input is stored as well so that its id cannot be reused while the entry is alive.
+_INPUT_HTML_CACHE = {}
+
+# Titles used in get_epsinf. Plain HTML so that the browser does not need to typeset LaTeX.
+_EPS0_TITLE_HTML = '<span style="font-size: 18pt">&epsilon;<sup>0</sup> in Cart. coords:</span>'
+_EPSINF_TITLE_HTML = '<span style="font-size: 18pt">&epsilon;<sup>&infin;</sup> in Cart. coords:</span>'
+
+# Max number of points per curve sent to the browser. Curves with more points are downsampled with LTTB.
+_PLOTLY_MAX_POINTS = 1000
+
+
+def _getmtime_or_zero(path):
+    """Return the modification time of path or 0 if the file has been removed."""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+
+def _disk_cached(ckey, func):
+    """
+    Return func() using a persistent cache stored in the directory specified by the ABIPY_PANEL_CACHE_DIR
+    env variable so that the anaddb results survive server restarts. func() is called directly if the variable
+    is not defined. ckey must depend on the content of the DDB file(s) and on the anaddb parameters.
+    None is never stored and exceptions raised by func are propagated.
+    The directory must be writable only by trusted users as loading a pickle file can execute arbitrary code.
+    Only the last _ANADDB_CACHE_MAXSIZE entries (according to the modification time) are kept.
+    """
+    cache_dir = os.environ.get("ABIPY_PANEL_CACHE_DIR")
+    if not cache_dir:
+        return func()
+
+    path = os.path.join(cache_dir, hashlib.sha256(ckey.encode()).hexdigest() + ".pickle")
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as fh:
+                ret = pickle.load(fh)
+            os.utime(path)
+            return ret
+        except Exception as exc:
+            warnings.warn(f"Ignoring exception while reading {path}:\n{exc}")
+
+    ret = func()
+    if ret is None: return ret
+
+    # Write to a temporary file and rename it so that other processes never read an incomplete file.
+    # Objects that cannot be pickled are not cached.
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as fh:
+        try:
+            pickle.dump(ret, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            saved = True
+        except Exception:
+            saved = False
+
+    if saved:
+        os.replace(fh.name, path)
+    else:
+        os.remove(fh.name)
+
+    # The directory may be shared by other processes that remove files at the same time.
+    paths = sorted(glob.glob(os.path.join(cache_dir, "*.pickle")), key=_getmtime_or_zero)
+    for old_path in paths[:-_ANADDB_CACHE_MAXSIZE]:
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass
+
+    return ret
+
+
+def _file_md5(filepath):
+    """Return the md5 hexdigest of the content of the file. Used to build the keys of the anaddb caches."""
+    md5 = hashlib.md5()
+    with open(filepath, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _anaddb_cached(md5, key, func, **kwargs):
+    """
+    Call func(**kwargs) and store the result in the process-wide cache provided by panel
+    (and in the disk cache if enabled, see _disk_cached) so that we don't rerun anaddb if the same DDB file
+    is analyzed with the same parameters. md5 is the checksum of the DDB file and key the name of the calculation.
+    The results are shared by all the user sessions. Only the last _ANADDB_CACHE_MAXSIZE entries are kept.
+    as_cached uses a lock per key so concurrent sessions do not run anaddb twice with the same input.
+    """
+    # verbose, mpi_procs and num_cpus do not change the results.
+    items = sorted((k, v) for k, v in kwargs.items() if k not in ("verbose", "mpi_procs", "num_cpus"))
+    ckey = f"anaddb:{md5}:{key}:{items}"
+
+    ret = pn.state.as_cached(ckey, functools.partial(_disk_cached, ckey, functools.partial(func, **kwargs)))
+
+    # Move key to the end of the list and remove the least recently used entries.
+    with _ANADDB_CACHE_LOCK:
+        if ckey in _ANADDB_CACHE_KEYS: _ANADDB_CACHE_KEYS.remove(ckey)
+        _ANADDB_CACHE_KEYS.append(ckey)
+        while len(_ANADDB_CACHE_KEYS) > _ANADDB_CACHE_MAXSIZE:
+            # as_cached stores the value with key (ckey,) + tuple(kwargs.items())
+            pn.state.cache.pop((_ANADDB_CACHE_KEYS.pop(0),), None)
+
+    return ret
+
+
+def _cached_anacompare_asr_dipdip(ddb, md5, pre_label=None, **kwargs):
+    """
+    Call ddb.anacompare_asr_dipdip with kwargs and return (asr_plotter, dipdip_plotter).
+    The plotters are cached by the md5 checksum of the DDB file and the anaddb parameters
+    so that the results are reused by all the panels, independently of the label.
+    """
+    plotters = _anaddb_cached(md5, "anacompare_asr_dipdip", ddb.anacompare_asr_dipdip, **kwargs)
+
+    if pre_label is None: return plotters
+
+    # Build new plotters with the same labels as the ones produced by anacompare_asr_dipdip with pre_label.
+    return tuple(PhononBandsPlotter(
+        key_phbands=[("%s (%s)" % (pre_label, k), v) for k, v in plotter.phbands_dict.items()],
+        key_phdos=[("%s (%s)" % (pre_label, k), v) for k, v in plotter.phdoses_dict.items()])
+        for plotter in plotters)
+
+
+def _float32_fig(fig):
+    """
+    Convert in place the x, y, z data of the traces of the plotly figure to single precision. Return fig.
+    Single precision is enough for plotting and halves the size of the payload sent to the browser.
+    """
+    for trace in fig.data:
+        for name in ("x", "y", "z"):
+            values = getattr(trace, name, None)
+            if isinstance(values, np.ndarray) and values.dtype == np.float64:
+                trace[name] = values.astype(np.float32)
+
+    return fig
+
+
+def _plotly_json_float32(fig):
+    """Return the JSON-ready dict of the plotly figure with the data of the traces in single precision."""
+    return _float32_fig(fig).to_plotly_json()
 
 
 class PanelWithAnaddbParams(param.Parameterized):
@@ -37,6 +200,9 @@ class PanelWithAnaddbParams(param.Parameterized):
 
     plot_ifc_yscale = param.ObjectSelector(default="linear", objects=["log", "linear", "symlog", "logit"])
 
+    num_cpus = param.Integer(max(1, (os.cpu_count() or 1) // 2), bounds=(1, None),
+                             doc="Number of threads used to run anaddb with different q-meshes")
+
     def __init__(self, **params):
         super().__init__(**params)
 
@@ -51,6 +217,14 @@ class PanelWithAnaddbParams(param.Parameterized):
         # Base buttons
         self.plot_check_asr_dipdip_btn = pnw.Button(name="Compute phonons with/wo ASR and DIPDIP", button_type='primary')
 
+    @staticmethod
+    def _anaddb_effective_nprocs(ddb, nqsmall, requested):
+        """
+        Return the number of MPI processes for anaddb. The requested value is capped by the number
+        of q-points in the DOS mesh (at most nqsmall**3) and by 6 * natom so that we don't have idle processes.
+        """
+        return max(1, min(requested, nqsmall ** 3, 6 * len(ddb.structure)))
+
     def kwargs_for_anaget_phbst_and_phdos_files(self, **extra_kwargs):
         """
         Return the parameters require to invoke anaget_phbst_and_phdos_files
@@ -90,77 +264,153 @@ class DdbFilePanel(PanelWithStructure, PanelWithAnaddbParams):
 
         self.stacked_pjdos = pnw.Checkbox(name="Stacked PJDOS", value=True)
 
+        # (ddb, md5 checksum) of the DDB file used to share the anaddb results across sessions. See _cached_call.
+        self._ddb_md5 = None
+
+        # Watcher used to update the eps0(w) figures in place. See plot_eps0w.
+        self._eps0w_watcher = None
+
+    def _get_ddb_md5(self):
+        """Return the md5 checksum of the DDB file. Recomputed only if the DDB file has been changed."""
+        if self._ddb_md5 is None or self._ddb_md5[0] is not self.ddb:
+            self._ddb_md5 = (self.ddb, _file_md5(self.ddb.filepath))
+
+        return self._ddb_md5[1]
+
+    def _cached_call(self, key, func, **kwargs):
+        """
+        Call func(**kwargs) and cache the result with the checksum of the DDB file. See _anaddb_cached.
+        """
+        return _anaddb_cached(self._get_ddb_md5(), key, func, **kwargs)
+
+    @staticmethod
+    def _get_input_html(inp):
+        """
+        Return the HTML representation of the anaddb input.
+        The inputs returned by _cached_call are shared so the HTML string is computed only once.
+        """
+        entry = _INPUT_HTML_CACHE.get(id(inp))
+        if entry is None or entry[0] is not inp:
+            entry = _INPUT_HTML_CACHE[id(inp)] = (inp, inp._repr_html_())
+            while len(_INPUT_HTML_CACHE) > _ANADDB_CACHE_MAXSIZE:
+                _INPUT_HTML_CACHE.pop(next(iter(_INPUT_HTML_CACHE)))
+
+        return entry[1]
+
+    def _anaddb_html(self, inp):
+        """
+        Return the HTML widget with the anaddb input and the clipboard button.
+        The HTML string is cached with the input object. See _get_input_html.
+        """
+        return self.html_with_clipboard_btn(self._get_input_html(inp))
+
+    def _anaget_phbands_and_phdos(self, **kwargs):
+        """
+        Call anaget_phbst_and_phdos_files, read the data used by the GUI and close the netcdf files.
+        Return (phbands, phdos, pjdos_symbol, anaddb_input). The netcdf files are not returned
+        as they cannot be pickled by _disk_cached.
+        """
+        with self.ddb.anaget_phbst_and_phdos_files(**kwargs) as g:
+            phbst_file, phdos_file = g
+            return phbst_file.phbands, phdos_file.phdos, phdos_file.pjdos_symbol, g.input
+
+    def _anacompare_phdos(self, nqsmalls, **kwargs):
+        """
+        Call anacompare_phdos and return (phdos_plotter, log) where log is the text
+        with the progress and the convergence of the DOSes.
+        """
+        # verbose only affects what is written to stream here.
+        stream = StringIO()
+        kwargs["verbose"] = max(1, kwargs.get("verbose", 0))
+        r = self.ddb.anacompare_phdos(nqsmalls, stream=stream, **kwargs)
+        return r.plotter, stream.getvalue()
+
     @depends_on_btn_click('get_epsinf_btn')
     def get_epsinf(self):
         """Compute eps_infinity and Born effective charges from DDB."""
 
-        epsinf, becs = self.ddb.anaget_epsinf_and_becs(chneut=self.chneut,
-                                                       mpi_procs=self.mpi_procs, verbose=self.verbose)
+        epsinf, becs = self._cached_call("epsinf_and_becs", self.ddb.anaget_epsinf_and_becs,
+                                         chneut=self.chneut, mpi_procs=self.mpi_procs, verbose=self.verbose)
 
-        gen, inp = self.ddb.anaget_dielectric_tensor_generator(asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
-                                                               mpi_procs=self.mpi_procs, verbose=self.verbose,
-                                                               return_input=True)
+        gen, inp = self._cached_call("dielectric_tensor_generator", self.ddb.anaget_dielectric_tensor_generator,
+                                     asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
+                                     mpi_procs=self.mpi_procs, verbose=self.verbose, return_input=True)
 
         # Fill column
         col = pn.Column(sizing_mode='stretch_width'); ca = col.append
         #df_kwargs = dict(auto_edit=False, autosize_mode="fit_viewport")
 
         eps0 = gen.tensor_at_frequency(w=0, gamma_ev=self.gamma_ev)
-        df_kwargs = {}
+        df_kwargs = dict(wdg_type="tabulator")
 
-        from abipy.panels.core import MyMarkdown as m
-        m = pn.pane.LaTeX
-        def m(s):
-            return pn.Row(pn.pane.LaTeX(s, style={'font-size': '18pt'}), sizing_mode="stretch_width")
+        def m(html):
+            return pn.Row(pn.pane.HTML(html), sizing_mode="stretch_width")
 
-        #ca(m(r"$\epsilon^0$ in Cart. coords (computed with Gamma_eV):"))
-        ca(m(r"$\epsilon^0$ in Cart. coords:"))
+        ca(m(_EPS0_TITLE_HTML))
         ca(dfc(eps0.get_dataframe(cmode="real"), **df_kwargs))
-        ca(m(r"$\epsilon^\infty$ in Cart. coords:"))
+        ca(m(_EPSINF_TITLE_HTML))
         ca(dfc(epsinf.get_dataframe(), **df_kwargs))
         ca("## Born effective charges in Cart. coords:")
         ca(dfc(becs.get_voigt_dataframe(), **df_kwargs))
         ca("## Anaddb input file.")
-        ca(pn.pane.HTML(inp._repr_html_()))
+        ca(pn.pane.HTML(self._get_input_html(inp)))
 
         return col
 
     @depends_on_btn_click('plot_eps0w_btn')
     def plot_eps0w(self):
         """Compute eps0(omega) from DDB and plot the results."""
-        gen, inp = self.ddb.anaget_dielectric_tensor_generator(asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
-                                                               mpi_procs=self.mpi_procs, verbose=self.verbose,
-                                                               return_input=True)
-        ws = self.w_range
-        w_max = ws[1]
-        if w_max == 1.0: w_max = None # Will compute w_max in plot routine from ph freqs.
-
-        def p(component, reim):
+        gen, inp = self._cached_call("dielectric_tensor_generator", self.ddb.anaget_dielectric_tensor_generator,
+                                     asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
+                                     mpi_procs=self.mpi_procs, verbose=self.verbose, return_input=True)
+
+        def get_figs():
+            w_max = self.w_range[1]
+            if w_max == 1.0: w_max = None # Will compute w_max in plot routine from ph freqs.
             # Matplotlib
-            #return mpl(gen.plot(w_min=ws[0], w_max=w_max, gamma_ev=self.gamma_ev, num=500, component=component,
-            #                reim=reim, units=self.units, **self.mpl_kwargs))
-            fig = gen.plotly(w_min=ws[0], w_max=w_max, gamma_ev=self.gamma_ev, num=500, component=component,
-                              reim=reim, units=self.units, show=False)
-            return ply(fig, with_help=False)
+            #return mpl(gen.plot(w_min=w_range[0], w_max=w_max, gamma_ev=gamma_ev, num=500, component=component,
+            #                reim=reim, units=units, **self.mpl_kwargs))
+            return [_float32_fig(gen.plotly(w_min=self.w_range[0], w_max=w_max, gamma_ev=self.gamma_ev, num=500,
+                               component=component, reim=reim, units=self.units,
+                               max_points=_PLOTLY_MAX_POINTS, show=False))
+                    for component, reim in [("diag", "re"), ("diag", "im"), ("offdiag", "re"), ("offdiag", "im")]]
+
+        # The figures are built once. When w_range, gamma_ev or units change, the traces are updated
+        # in place with batch_update so that anaddb is not executed again and the plotly panes are not rebuilt.
+        plys = [ply(fig, with_help=False) for fig in get_figs()]
+        panes = [c[0] for c in plys]
+
+        def update_figs(*events):
+            for pane, new_fig in zip(panes, get_figs()):
+                fig = pane.object
+                if len(fig.data) != len(new_fig.data):
+                    pane.object = new_fig
+                    continue
+                with fig.batch_update():
+                    for trace, new_trace in zip(fig.data, new_fig.data):
+                        trace.update(x=new_trace.x, y=new_trace.y)
+                    fig.layout.xaxis.title = new_fig.layout.xaxis.title
+                pane.param.trigger("object")
+
+        # Remove the callback registered by the previous call.
+        if self._eps0w_watcher is not None: self.param.unwatch(self._eps0w_watcher)
+        self._eps0w_watcher = self.param.watch(update_figs, ["w_range", "gamma_ev", "units"])
 
         col = pn.Column(sizing_mode='stretch_width'); ca = col.append
 
-        # Add figures
+        # Add figures. Tabs are dynamic so that only the active figure is rendered by the browser.
         ca("## epsilon(w):")
-        ca(p("diag", "re"))
-        ca(p("diag", "im"))
-        ca(p("offdiag", "re"))
-        ca(p("offdiag", "im"))
-
-        #gspec[2, :] = gen.get_oscillator_dataframe(reim="all", tol=1e-6)
-        # TODO: FIX
-        # TypeError: Object of type complex is not JSON serializable
-        #dfc(gen.get_oscillator_dataframe(reim="all", tol=1e-6))
+        titles = ["Re diagonal", "Im diagonal", "Re off-diagonal", "Im off-diagonal"]
+        ca(pn.Tabs(*zip(titles, plys), dynamic=True, sizing_mode="stretch_width"))
+
+        # Complex numbers are not JSON serializable so we show the real and the imaginary part in different columns.
         ca("## Oscillator matrix elements:")
-        ca(gen.get_oscillator_dataframe(reim="all", tol=1e-6))
+        df_re = gen.get_oscillator_dataframe(reim="re", tol=1e-6).add_prefix("Re ")
+        df_im = gen.get_oscillator_dataframe(reim="im", tol=1e-6).add_prefix("Im ")
+        ca(dfc(pd.concat([df_re, df_im], axis=1), wdg_type="tabulator"))
         # Add HTML pane with input.
         ca("## Anaddb input file:")
-        ca(pn.pane.HTML(inp._repr_html_()))
+        ca(pn.pane.HTML(self._get_input_html(inp)))
 
         #return gspec
         return col
@@ -173,36 +423,47 @@ class DdbFilePanel(PanelWithStructure, PanelWithAnaddbParams):
         # Computing phbands
         kwargs = self.kwargs_for_anaget_phbst_and_phdos_files(return_input=True)
 
-        with self.ddb.anaget_phbst_and_phdos_files(**kwargs) as g:
-            phbst_file, phdos_file = g
-            phbands, phdos = phbst_file.phbands, phdos_file.phdos
-
-            # Fill column
-            col = pn.Column(sizing_mode='stretch_width'); ca = col.append
+        phbands, phdos, pjdos_symbol, inp = self._cached_call("phbands_and_phdos",
+                                                              self._anaget_phbands_and_phdos, **kwargs)
 
-            ca("## Phonon band structure and DOS:")
-            ca(ply(phbands.plotly_with_phdos(phdos, units=self.units, show=False)))
+        # Fill column
+        col = pn.Column(sizing_mode='stretch_width'); ca = col.append
 
-            ca("## Brillouin zone and q-path:")
-            qpath_pane = ply(phbands.qpoints.plotly(show=False), with_divider=False)
-            df_qpts = phbands.qpoints.get_highsym_datataframe()
-            ca(pn.Row(qpath_pane, df_qpts))
-            ca(pn.layout.Divider())
+        # The figures are bound to the widgets so that changing units, stacked_pjdos or temp_range
+        # rebuilds the figures from the data in memory without rerunning anaddb.
+        def plot_phbands_with_phdos(units):
+            fig = phbands.plotly_with_phdos(phdos, units=units, max_points=_PLOTLY_MAX_POINTS, show=False)
+            return ply(_float32_fig(fig))
 
-            ca("## Type-projected phonon DOS:")
-            ca(ply(phdos_file.plotly_pjdos_type(units=self.units, stacked=self.stacked_pjdos.value, show=False)))
+        def plot_pjdos_type(units, stacked):
+            # plotly_pjdos_type only needs the frequency mesh and the DOSes so the netcdf file is not required.
+            data = types.SimpleNamespace(wmesh=phdos.mesh, phdos=phdos, pjdos_symbol=pjdos_symbol)
+            fig = PhdosFile.plotly_pjdos_type(data, units=units, stacked=stacked, show=False)
+            return ply(_float32_fig(fig))
 
-            ca("## Thermodynamic properties in the harmonic approximation:")
-            temps = self.temp_range
-            ca(ply(phdos.plotly_harmonic_thermo(tstart=temps[0], tstop=temps[1], num=50, show=False)))
-            #ca(mpl(phdos_file.msqd_dos.plot(units=self.units, **self.mpl_kwargs)))
-            #msqd_dos.plot_tensor(**self.mpl_kwargs)
+        def plot_harmonic_thermo(temps):
+            return ply(_float32_fig(phdos.plotly_harmonic_thermo(tstart=temps[0], tstop=temps[1], num=50, show=False)))
 
-            # Add Anaddb input file
-            ca("## Anaddb input file:")
-            ca(self.html_with_clipboard_btn(g.input._repr_html_()))
+        def plot_qpath():
+            qpath_pane = ply(phbands.qpoints.plotly(show=False), with_divider=False)
+            df_qpts = phbands.qpoints.get_highsym_datataframe()
+            return pn.Row(qpath_pane, df_qpts)
+
+        # Tabs are dynamic so that only the active figure is built and rendered by the browser.
+        ca(pn.Tabs(
+            ("Phonon bands and DOS", pn.bind(plot_phbands_with_phdos, units=self.param.units)),
+            ("BZ and q-path", pn.panel(plot_qpath, defer_load=True)),
+            ("Type-projected DOS", pn.bind(plot_pjdos_type, units=self.param.units, stacked=self.stacked_pjdos)),
+            ("Harmonic thermodynamics", pn.bind(plot_harmonic_thermo, temps=self.param.temp_range)),
+            dynamic=True, sizing_mode="stretch_width"))
+        #ca(mpl(phdos_file.msqd_dos.plot(units=self.units, **self.mpl_kwargs)))
+        #msqd_dos.plot_tensor(**self.mpl_kwargs)
+
+        # Add Anaddb input file
+        ca("## Anaddb input file:")
+        ca(self._anaddb_html(inp))
 
-            return col
+        return col
 
     @depends_on_btn_click('plot_vsound_btn')
     def plot_vsound(self):
@@ -213,12 +474,13 @@ class DdbFilePanel(PanelWithStructure, PanelWithAnaddbParams):
         col = pn.Column(sizing_mode="stretch_width"); ca = col.append
 
         from abipy.dfpt.vsound import SoundVelocity
-        sv = SoundVelocity.from_ddb(self.ddb.filepath, num_points=20, qpt_norm=0.1,
-                                    ignore_neg_freqs=True, asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
-                                    verbose=self.verbose, mpi_procs=self.mpi_procs)
+        sv = self._cached_call("vsound", functools.partial(SoundVelocity.from_ddb, self.ddb.filepath),
+                               num_points=20, qpt_norm=0.1,
+                               ignore_neg_freqs=True, asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
+                               verbose=self.verbose, mpi_procs=self.mpi_procs)
 
         ca("## Linear least-squares fit:")
-        ca(ply(sv.plotly(show=False)))
+        ca(ply(_float32_fig(sv.plotly(show=False))))
         ca("## Speed of sound computed along different q-directions in reduced coords:")
         ca(dfc(sv.get_dataframe()))
 
@@ -231,24 +493,30 @@ class DdbFilePanel(PanelWithStructure, PanelWithAnaddbParams):
         and the treatment of the dipole-dipole interaction in the dynamical matrix.
         Requires DDB file with eps_inf, BECS.
         """
-        asr_plotter = self.ddb.anacompare_asr(asr_list=(0, 2), chneut_list=(1, ), dipdip=1,
-                                              lo_to_splitting=self.lo_to_splitting,
-                                              nqsmall=self.nqsmall, ndivsm=self.ndivsm,
-                                              dos_method=self.dos_method, ngqpt=None,
-                                              verbose=self.verbose, mpi_procs=self.mpi_procs)
-
-        dipdip_plotter = self.ddb.anacompare_dipdip(chneut_list=(1,), asr=2, lo_to_splitting=self.lo_to_splitting,
-                                                    nqsmall=self.nqsmall, ndivsm=self.ndivsm,
-                                                    dos_method=self.dos_method, ngqpt=None,
-                                                    verbose=self.verbose, mpi_procs=self.mpi_procs)
+        # anaddb is executed once for each (asr, chneut, dipdip) combination and the independent
+        # runs (3 with these parameters) are executed concurrently as each anaddb run uses its own workdir.
+        # The MPI processes are shared among the concurrent runs.
+        num_cpus = min(3, os.cpu_count() or 1)
+        mpi_procs = self._anaddb_effective_nprocs(self.ddb, self.nqsmall, max(1, self.mpi_procs // num_cpus))
+        if self.verbose and mpi_procs != self.mpi_procs:
+            print(f"Using {num_cpus} concurrent anaddb runs with {mpi_procs} MPI processes each")
+
+        # The plotters are shared with the robot panels. See _cached_anacompare_asr_dipdip.
+        asr_plotter, dipdip_plotter = _cached_anacompare_asr_dipdip(self.ddb, self._get_ddb_md5(),
+                                                                    asr_list=(0, 2), chneut_list=(1, ),
+                                                                    lo_to_splitting=self.lo_to_splitting,
+                                                                    nqsmall=self.nqsmall, ndivsm=self.ndivsm,
+                                                                    dos_method=self.dos_method, ngqpt=None,
+                                                                    verbose=self.verbose, mpi_procs=mpi_procs,
+                                                                    num_cpus=num_cpus)
 
         # Fill column
         col = pn.Column(sizing_mode='stretch_width'); ca = col.append
 
         ca("## Phonon bands and DOS with/wo acoustic sum rule:")
-        ca(ply(asr_plotter.combiplotly(show=False)))
+        ca(ply(_plotly_json_float32(asr_plotter.combiplotly(show=False))))
         ca("## Phonon bands and DOS with/without the treatment of the dipole-dipole interaction:")
-        ca(ply(dipdip_plotter.combiplotly(show=False)))
+        ca(ply(_plotly_json_float32(dipdip_plotter.combiplotly(show=False))))
 
         return col
 
@@ -260,21 +528,25 @@ class DdbFilePanel(PanelWithStructure, PanelWithAnaddbParams):
         Requires DDB file with eps_inf, BECS and dynamical quadrupoles.
         """
         #print(self.nqsmall_list.value)
-        r = self.ddb.anacompare_phdos(self.nqsmall_list.value, asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
-                                      dos_method=self.dos_method, ngqpt=None,
-                                      verbose=self.verbose, num_cpus=1, stream=sys.stdout)
-
-        #r.phdoses: List of |PhononDos| objects
+        # Capture the log with the progress and the convergence of the DOSes so that we can show it in the GUI.
+        phdos_plotter, log = self._cached_call("anacompare_phdos", self._anacompare_phdos,
+                                               nqsmalls=list(self.nqsmall_list.value),
+                                               asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
+                                               dos_method=self.dos_method, ngqpt=None,
+                                               verbose=self.verbose, num_cpus=self.num_cpus)
 
         # Fill column
         col = pn.Column(sizing_mode='stretch_width'); ca = col.append
         ca("## Phonon DOSes obtained with different q-meshes:")
-        ca(ply(r.plotter.combiplotly(show=False)))
+        ca(ply(_float32_fig(phdos_plotter.combiplotly(show=False))))
 
         ca("## Convergence of termodynamic properties.")
         temps = self.temp_range
-        ca(mpl(r.plotter.plot_harmonic_thermo(tstart=temps[0], tstop=temps[1], num=50,
-                                              units=self.units, **self.mpl_kwargs)))
+        ca(mpl(phdos_plotter.plot_harmonic_thermo(tstart=temps[0], tstop=temps[1], num=50,
+                                                  units=self.units, **self.mpl_kwargs)))
+
+        ca("## Log:")
+        ca(bkw.PreText(text=log))
 
         return col
 
@@ -285,21 +557,22 @@ class DdbFilePanel(PanelWithStructure, PanelWithAnaddbParams):
         of the dipole-quadrupole and quadrupole-quadrupole terms in the dynamical matrix.
         Requires DDB file with eps_inf, BECS and dynamical quadrupoles.
         """
-        plotter = self.ddb.anacompare_quad(asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
-                                           lo_to_splitting=self.lo_to_splitting,
-                                           nqsmall=0, ndivsm=self.ndivsm, dos_method=self.dos_method, ngqpt=None,
-                                           verbose=self.verbose, mpi_procs=self.mpi_procs)
+        plotter = self._cached_call("anacompare_quad", self.ddb.anacompare_quad,
+                                    asr=self.asr, chneut=self.chneut, dipdip=self.dipdip,
+                                    lo_to_splitting=self.lo_to_splitting,
+                                    nqsmall=0, ndivsm=self.ndivsm, dos_method=self.dos_method, ngqpt=None,
+                                    verbose=self.verbose, mpi_procs=self.mpi_procs)
 
         # Fill column
         col = pn.Column(sizing_mode='stretch_width'); ca = col.append
         ca("## Phonon Bands obtained with different q-meshes:")
-        ca(ply(plotter.combiplotly(show=False)))
+        ca(ply(_float32_fig(plotter.combiplotly(show=False))))
 
         return col
 
     @depends_on_btn_click('plot_ifc_btn')
     def on_plot_ifc(self):
-        ifc = self.ddb.anaget_ifc(asr=self.asr, chneut=self.chneut, dipdip=self.dipdip)
+        ifc = self._cached_call("ifc", self.ddb.anaget_ifc, asr=self.asr, chneut=self.chneut, dipdip=self.dipdip)
 
         kwds = self.mpl_kwargs.copy()
         kwds["yscale"] = self.plot_ifc_yscale
@@ -313,71 +586,75 @@ class DdbFilePanel(PanelWithStructure, PanelWithAnaddbParams):
 
         return col
 
+    def get_summary_row(self):
+        """Return Column with the string representation of the DDB file."""
+        return summary_row(self.ddb, self.verbose)
+
     def get_panel(self, as_dict=False, **kwargs):
         """
         Return tabs with widgets to interact with the DDB file.
         """
         ddb = self.ddb
         d = {}
-        d["Summary"] = pn.Row(
-            bkw.PreText(text=self.ddb.to_string(verbose=self.verbose), sizing_mode="scale_both")
-        )
+        d["Summary"] = self.get_summary_row
 
         # Note how we build tabs according to the content of the DDB.
-        if ddb.has_at_least_one_atomic_perturbation():
-            d["PH-bands"] = pn.Row(
+        # The content of the tabs is built by callables, only when the tab is activated. See lazy_tabs.
+        has_atomic_pert = ddb.has_at_least_one_atomic_perturbation()
+        if has_atomic_pert:
+            d["PH-bands"] = lambda: pn.Row(
                 self.pws_col(["### PH-bands options", "nqsmall", "ndivsm", "asr", "chneut", "dipdip",
                               "lo_to_splitting", "dos_method", "stacked_pjdos", "temp_range", "plot_phbands_btn",
                               self.helpc("on_plot_phbands_and_phdos")]),
                 self.on_plot_phbands_and_phdos
             )
         if ddb.has_bec_terms(select="at_least_one"):
-            d["BECs"] = pn.Row(
+            d["BECs"] = lambda: pn.Row(
                 self.pws_col(["### Born effective charges options", "asr", "chneut", "dipdip", "gamma_ev",
                               "get_epsinf_btn", self.helpc("get_epsinf")]),
                 self.get_epsinf
             )
         if ddb.has_epsinf_terms(select="at_least_one_diagoterm"):
-            d["eps0"] = pn.Row(
+            d["eps0"] = lambda: pn.Row(
                 self.pws_col(["### epsilon_0", "asr", "chneut", "dipdip", "gamma_ev", "w_range", "plot_eps0w_btn",
                               self.helpc("plot_eps0w")]),
                 self.plot_eps0w
             )
-        if ddb.has_at_least_one_atomic_perturbation():
-            d["Speed of sound"] = pn.Row(
+        if has_atomic_pert:
+            d["Speed of sound"] = lambda: pn.Row(
                 self.pws_col(["### Speed of sound options", "asr", "chneut", "dipdip", "plot_vsound_btn",
                              self.helpc("plot_vsound")]),
                 self.plot_vsound
             )
-            d["ASR & DIPDIP"] = pn.Row(
+            d["ASR & DIPDIP"] = lambda: pn.Row(
                 self.pws_col(["### ASR & DIPDIP options", "nqsmall", "ndivsm", "dos_method", "plot_check_asr_dipdip_btn",
                              self.helpc("plot_without_asr_dipdip")]),
                 self.plot_without_asr_dipdip
             )
-            d["DOS vs q-mesh"] = pn.Row(
+            d["DOS vs q-mesh"] = lambda: pn.Row(
                 self.pws_col(["### DOS vs q-mesh options", "asr", "chneut", "dipdip", "dos_method", "nqsmall_list",
-                             "temp_range", "plot_dos_vs_qmesh_btn", self.helpc("plot_dos_vs_qmesh")]),
+                             "temp_range", "num_cpus", "plot_dos_vs_qmesh_btn", self.helpc("plot_dos_vs_qmesh")]),
                 self.plot_dos_vs_qmesh
             )
             if ddb.has_quadrupole_terms():
-                d["Quadrupoles"] = pn.Row(
+                d["Quadrupoles"] = lambda: pn.Row(
                     self.pws_col(["### Quadrupoles options", "asr", "chneut", "dipdip", "lo_to_splitting", "ndivsm", "dos_method",
                                   "plot_phbands_quad_btn", self.helpc("plot_phbands_quad")]),
                     self.plot_phbands_quad
                 )
-            d["IFCs"] = pn.Row(
+            d["IFCs"] = lambda: pn.Row(
                 self.pws_col(["### IFCs options", "asr", "dipdip", "chneut",
                                "plot_ifc_yscale", "plot_ifc_btn", self.helpc("on_plot_ifc")]),
                 self.on_plot_ifc
             )
 
-        d["Structure"] = self.get_struct_view_tab_entry()
-        d["Global"] = pn.Row(
+        d["Structure"] = self.get_struct_view_tab_entry
+        d["Global"] = lambda: pn.Row(
             self.pws_col(["### Global options", "units", "mpi_procs", "verbose"]),
             self.get_software_stack()
         )
 
-        if as_dict: return d
+        if as_dict: return {k: v() if callable(v) else v for k, v in d.items()}
         return self.get_template_from_tabs(d, template=kwargs.get("template", None))
 
 
@@ -426,10 +703,10 @@ Also, avoid uploading big files (size > XXX).
         self.abifile = new_abifile
         self.main_area.objects = [self.abifile.get_panel()]
 
-    def on_mpid_input(self, event):
+    async def on_mpid_input(self, event):
 
         with Loading(self.mpid_input, err_wdg=self.mpid_err_wdg):
-            self.abifile = Structure.from_mpid(self.mpid_input.value)
+            self.abifile = await run_in_thread(Structure.from_mpid, self.mpid_input.value)
 
         self.main_area.objects = [self.abifile.get_panel()]
 
@@ -494,6 +771,9 @@ it is also possible to fetch the DDB file from the Materials Project Database.
                                    sizing_mode="stretch_width")
         self.abifile = None
 
+        # md5 of the last uploaded file. Used to avoid rebuilding the panel if the same file is uploaded again.
+        self._upload_md5 = None
+
         self.file_input = pnw.FileInput(height=60, css_classes=["pnx-file-upload-area"])
         self.file_input.param.watch(self.on_file_input, "value")
 
@@ -505,19 +785,23 @@ it is also possible to fetch the DDB file from the Materials Project Database.
 
     def on_file_input(self, event):
         self.mpid_err_wdg.object = ""
+        upload_md5 = hashlib.md5(self.file_input.value).hexdigest()
+        if upload_md5 == self._upload_md5 and self.abifile is not None: return
         new_abifile = self.get_abifile_from_file_input(self.file_input)
 
         if self.abifile is not None:
             self.abifile.remove()
 
         self.abifile = new_abifile
+        self._upload_md5 = upload_md5
         self.main_area.objects = [self.abifile.get_panel()]
 
-    def on_mpid_input(self, event):
+    async def on_mpid_input(self, event):
 
         from abipy.dfpt.ddb import DdbFile
         with Loading(self.mpid_input, err_wdg=self.mpid_err_wdg):
-            self.abifile = DdbFile.from_mpid(self.mpid_input.value)
+            self.abifile = await run_in_thread(DdbFile.from_mpid, self.mpid_input.value)
+            self._upload_md5 = None
 
         self.main_area.objects = [self.abifile.get_panel()]
 
@@ -563,18 +847,24 @@ This panel alllows users to upload a DDB file and compare it with the one availa
                                                   active=False, width=100, height=10, align="center")
         self.mp_err_wdg = pn.pane.Markdown("")
 
-    def on_file_input(self, event):
-        abinit_ddb = self.get_abifile_from_file_input(self.file_input)
-        from abipy.dfpt.ddb import DdbFile, DdbRobot
+        # md5 of the last uploaded file. Used to avoid fetching the MP data and rebuilding the panel
+        # if the same file is uploaded again.
+        self._upload_md5 = None
 
-        # Match Abinit structure with MP.
-        mp = abinit_ddb.structure.mp_match()
+    async def on_file_input(self, event):
+        upload_md5 = hashlib.md5(self.file_input.value).hexdigest()
+        if upload_md5 == self._upload_md5: return
+        abinit_ddb = self.get_abifile_from_file_input(self.file_input)
+        from abipy.dfpt.ddb import DdbRobot
 
+        # Network requests are executed in a separate thread to keep the GUI responsive.
         with ActiveBar(self.mp_progress, err_wdg=self.mp_err_wdg):
-            mpid_list = [mp_id for mp_id in mp.ids if mp_id != "this"]
-            ddb_robot = DdbRobot.from_mpid_list(mpid_list)
+            # Match Abinit structure with MP. Only the ids are needed to download the DDB files.
+            mpid_list = await run_in_thread(abinit_ddb.structure.mp_match_ids)
+            ddb_robot = await run_in_thread(DdbRobot.from_mpid_list, mpid_list)
             ddb_robot.add_file("Yours DDB", abinit_ddb)
 
+        self._upload_md5 = upload_md5
         self.main_area.objects = [DdbRobotPanel(ddb_robot).get_panel()]
 
     def get_panel(self):
@@ -605,6 +895,9 @@ class DdbRobotPanel(BaseRobotPanel, PanelWithAnaddbParams):
         self.combiplot_check_btn = pnw.CheckButtonGroup(name='Check Button Group',
                                                         value=['combiplot'], options=['combiplot', 'gridplot'])
 
+        # md5 checksums of the DDB files used to share the anaddb results. See _cached_anacompare_asr_dipdip.
+        self._ddb_md5s = tuple((label, _file_md5(ddb.filepath)) for label, ddb in robot.items())
+
     def kwargs_for_anaget_phbst_and_phdos_files(self, **extra_kwargs):
         """Extend method of base class to handle lo_to_splitting"""
         kwargs = super().kwargs_for_anaget_phbst_and_phdos_files(**extra_kwargs)
@@ -615,15 +908,40 @@ class DdbRobotPanel(BaseRobotPanel, PanelWithAnaddbParams):
                 if self.verbose:
                     print("Setting lo_to_splitting to False since at least one DDB file does not have LO-TO data.")
 
+        # Avoid idle MPI processes. The same value is used for all the DDB files.
+        mpi_procs = max(self._anaddb_effective_nprocs(ddb, self.nqsmall, self.mpi_procs)
+                        for ddb in self.robot.abifiles)
+        if mpi_procs != kwargs["mpi_procs"]:
+            kwargs["mpi_procs"] = mpi_procs
+            if self.verbose:
+                print(f"Using {mpi_procs} MPI processes for anaddb instead of {self.mpi_procs}")
+
         return kwargs
 
+    def _anaget_phonon_plotters(self, **kwargs):
+        """
+        Call robot.anaget_phonon_plotters and return (phbands_plotter, phdos_plotter).
+        A tuple is returned instead of the namedtuple as the latter cannot be pickled by _disk_cached.
+        """
+        r = self.robot.anaget_phonon_plotters(**kwargs)
+        return r.phbands_plotter, r.phdos_plotter
+
     @depends_on_btn_click('plot_combiplot_btn')
     def plot_combiplot(self, **kwargs):
         """Plot phonon band structures."""
         kwargs = self.kwargs_for_anaget_phbst_and_phdos_files()
 
+        # The anaddb calculations for the different DDB files are executed in a pool of threads.
+        # The MPI processes are shared among the concurrent runs to avoid oversubscription.
+        num_cpus = max(1, min(len(self.robot), os.cpu_count() or 1))
+        kwargs["mpi_procs"] = max(1, kwargs["mpi_procs"] // num_cpus)
+
         #TODO: Recheck lo-to automatic.
-        r = self.robot.anaget_phonon_plotters(**kwargs)
+        # verbose and mpi_procs do not change the results.
+        items = sorted((k, v) for k, v in kwargs.items() if k not in ("verbose", "mpi_procs"))
+        phbands_plotter, phdos_plotter = _disk_cached(f"anaddb_robot:{self._ddb_md5s}:phonon_plotters:{items}",
+                                                      functools.partial(self._anaget_phonon_plotters,
+                                                                        num_cpus=num_cpus, **kwargs))
         #r = self.robot.anaget_phonon_plotters()
 
         # Fill column
@@ -631,12 +949,12 @@ class DdbRobotPanel(BaseRobotPanel, PanelWithAnaddbParams):
 
         if "combiplot" in self.combiplot_check_btn.value:
             ca("## Combiplot:")
-            ca(ply(r.phbands_plotter.combiplotly(units=self.units, show=False)))
+            ca(ply(_float32_fig(phbands_plotter.combiplotly(units=self.units, show=False))))
 
         if "gridplot" in self.combiplot_check_btn.value:
             ca("## Gridplot:")
             # FIXME implement with_dos = True
-            ca(ply(r.phbands_plotter.gridplotly(units=self.units, with_dos=False, show=False)))
+            ca(ply(_float32_fig(phbands_plotter.gridplotly(units=self.units, with_dos=False, show=False))))
 
         #if "temp_range" in self.combiplot_check_btn.value:
         #temps = self.temp_range.value
@@ -763,57 +1081,85 @@ class DdbRobotPanel(BaseRobotPanel, PanelWithAnaddbParams):
 
     #        return gspec
 
-    # THIS OK but I don't think it's very useful
-    @depends_on_btn_click('plot_check_asr_dipdip_btn')
-    def plot_without_asr_dipdip(self):
+    def _anacompare_asr_dipdip(self):
         """
-        Compare phonon bands and DOSes computed with/without the acoustic sum rule
-        and the treatment of the dipole-dipole interaction in the dynamical matrix.
-        Requires DDB file with eps_inf, BECS.
+        Invoke anaddb for all the DDB files in the robot with/without the acoustic sum rule and the
+        treatment of the dipole-dipole interaction. Return (asr_plotter, dipdip_plotter).
         """
         asr_plotter = PhononBandsPlotter()
         dipdip_plotter = PhononBandsPlotter()
 
-        for label, ddb in self.robot.items():
-            asr_p = ddb.anacompare_asr(asr_list=(0, 2), chneut_list=(1, ), dipdip=1,
+        # The anaddb calculations for the different DDB files are independent so we execute them
+        # in a pool of threads (anaddb runs in a subprocess with its own workdir).
+        # The 3 runs of each DDB file are executed concurrently as well if there are enough CPUs.
+        # The total number of threads and of MPI processes is shared among the DDB files.
+        items = list(self.robot.items())
+        if not items: return asr_plotter, dipdip_plotter
+
+        ncpus = os.cpu_count() or 1
+        num_cpus = max(1, min(3, ncpus // len(items)))
+        mpi_procs = max(1, self.mpi_procs // (len(items) * num_cpus))
+
+        with ThreadPoolExecutor(max_workers=min(len(items), ncpus)) as executor:
+            futures = [executor.submit(_cached_anacompare_asr_dipdip, ddb, md5, asr_list=(0, 2), chneut_list=(1, ),
                                        lo_to_splitting=self.lo_to_splitting,
                                        nqsmall=self.nqsmall, ndivsm=self.ndivsm,
-                                       dos_method=self.dos_method, ngqpt=None,
-                                       verbose=self.verbose, mpi_procs=self.mpi_procs,
-                                       pre_label=label)
+                                       dos_method=self.dos_method, ngqpt=None, verbose=self.verbose,
+                                       mpi_procs=self._anaddb_effective_nprocs(ddb, self.nqsmall, mpi_procs),
+                                       num_cpus=num_cpus, pre_label=label)
+                       for (label, ddb), (_, md5) in zip(items, self._ddb_md5s)]
 
-            asr_plotter.append_plotter(asr_p)
+            # Fill the plotters in the main thread to preserve the order of the DDB files.
+            asr_subs, dipdip_subs = zip(*[future.result() for future in futures])
+            asr_plotter.extend(asr_subs)
+            dipdip_plotter.extend(dipdip_subs)
 
-            dipdip_p = ddb.anacompare_dipdip(chneut_list=(1,), asr=2, lo_to_splitting=self.lo_to_splitting,
-                                             nqsmall=self.nqsmall, ndivsm=self.ndivsm,
-                                             dos_method=self.dos_method, ngqpt=None,
-                                             verbose=self.verbose, mpi_procs=self.mpi_procs,
-                                             pre_label=label)
+        return asr_plotter, dipdip_plotter
 
-            dipdip_plotter.append_plotter(dipdip_p)
+    # THIS OK but I don't think it's very useful
+    def _anacompare_asr_dipdip_figs(self):
+        """
+        Call _anacompare_asr_dipdip and return the plotly figures of the two plotters as dictionaries
+        that can be passed to the Plotly pane.
+        """
+        asr_plotter, dipdip_plotter = self._anacompare_asr_dipdip()
+        # The figures contain the bands of all the DDB files so we use WebGL.
+        return (_plotly_json_float32(asr_plotter.combiplotly(webgl=True, show=False)),
+                _plotly_json_float32(dipdip_plotter.combiplotly(webgl=True, show=False)))
+
+    @depends_on_btn_click('plot_check_asr_dipdip_btn')
+    def plot_without_asr_dipdip(self):
+        """
+        Compare phonon bands and DOSes computed with/without the acoustic sum rule
+        and the treatment of the dipole-dipole interaction in the dynamical matrix.
+        Requires DDB file with eps_inf, BECS.
+        """
+        # The plotters of the individual DDB files are cached. See _cached_anacompare_asr_dipdip.
+        asr_fig, dipdip_fig = self._anacompare_asr_dipdip_figs()
 
         # Fill column
         col = pn.Column(sizing_mode='stretch_width'); ca = col.append
 
         ca("## Phonon bands and DOS with/wo acoustic sum rule:")
-        ca(ply(asr_plotter.combiplotly(show=False)))
+        ca(ply(asr_fig))
         ca("## Phonon bands and DOS with/without the treatment of the dipole-dipole interaction:")
-        ca(ply(dipdip_plotter.combiplotly(show=False)))
+        ca(ply(dipdip_fig))
 
         return col
 
+    def get_summary_row(self):
+        """Return Column with the string representation of the robot."""
+        return summary_row(self.robot, self.verbose)
+
     def get_panel(self, as_dict=False, **kwargs):
         """Return tabs with widgets to interact with the DDB file."""
-        robot = self.robot
-
+        # The content of the tabs is built by callables, only when the tab is activated. See lazy_tabs.
         d = {}
-        d["Summary"] = pn.Row(
-            bkw.PreText(text=robot.to_string(verbose=self.verbose), sizing_mode="scale_both")
-        )
+        d["Summary"] = self.get_summary_row
 
-        d["Params"] = self.get_compare_params_widgets()
+        d["Params"] = self.get_compare_params_widgets
 
-        d["Plot"] = pn.Row(
+        d["Plot"] = lambda: pn.Row(
             self.pws_col(["# PH-bands options",
                            "nqsmall", "ndivsm", "asr", "chneut", "dipdip",
                            "lo_to_splitting", "dos_method", "temp_range",
@@ -876,12 +1222,12 @@ class DdbRobotPanel(BaseRobotPanel, PanelWithAnaddbParams):
         #              ),
         #    self.on_plot_ifc)
         #))
-        d["Global"] = pn.Row(
+        d["Global"] = lambda: pn.Row(
             self.pws_col(["### Global options", "units", "mpi_procs", "verbose"]),
             self.get_software_stack()
         )
 
-        if as_dict: return d
+        if as_dict: return {k: v() if callable(v) else v for k, v in d.items()}
         return self.get_template_from_tabs(d, template=kwargs.get("template", None))
 
 
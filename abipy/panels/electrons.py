@@ -1,10 +1,51 @@
 """"AbiPy panels for electronic properties."""
 
+import time
+import hashlib
 import param
 import panel as pn
 import panel.widgets as pnw
 
-from .core import AbipyParameterized, ActiveBar, ply, mpl, depends_on_btn_click
+from concurrent.futures import ThreadPoolExecutor
+from .core import AbipyParameterized, ActiveBar, ply, mpl, depends_on_btn_click, run_in_thread
+
+
+def _http_status_code(exc):
+    """
+    Return the HTTP status code of the response associated to the exception
+    (or to the exception that caused it). None if not available.
+    """
+    while exc is not None:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+        if status_code is not None: return status_code
+        exc = exc.__cause__ or exc.__context__
+
+    return None
+
+
+def _ebands_from_mpid(mp_id, ntries=3):
+    """
+    Fetch the band structure with MP identifier `mp_id` from the MP website.
+    Retry with exponential backoff if the server is temporarily unavailable (HTTP 429 or 503).
+    """
+    from abipy.electrons.ebands import ElectronBands
+    for itry in range(ntries):
+        try:
+            return ElectronBands.from_mpid(mp_id)
+        except Exception as exc:
+            if itry == ntries - 1 or _http_status_code(exc) not in (429, 503): raise
+            time.sleep(2 ** itry)
+
+
+def _ebands_from_mpids(mp_ids, max_workers=8):
+    """
+    Fetch the band structures with MP identifiers `mp_ids` concurrently.
+    Threads are OK as the GIL is released while waiting for the HTTP responses.
+    Return list of ElectronBands (None if bands are not available).
+    """
+    if not mp_ids: return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(mp_ids))) as executor:
+        return list(executor.map(_ebands_from_mpid, mp_ids))
 
 
 class CompareEbandsWithMP(AbipyParameterized):
@@ -34,26 +75,28 @@ This panel alllows users to upload two files with KS energies.
 
         self.file_input = pnw.FileInput(height=60, css_classes=["pnx-file-upload-area"])
         self.file_input.param.watch(self.on_file_input, "value")
+        # md5 of the last uploaded file. Used to avoid fetching the MP data again if the same file is uploaded.
+        self._upload_md5 = None
         self.mp_progress = pn.indicators.Progress(name='Fetching data from the MP website', bar_color="warning",
                                                   active=False, width=200, height=10, align="center")
 
-    def on_file_input(self, event):
+    async def on_file_input(self, event):
+        upload_md5 = hashlib.md5(self.file_input.value).hexdigest()
+        if upload_md5 == self._upload_md5: return
         self.abinit_ebands = self.get_ebands_from_file_input(self.file_input)
 
-        # Match Abinit structure with MP
-        mp = self.abinit_ebands.structure.mp_match()
-        if not mp.structures:
-            raise RuntimeError("No structure found in the MP database")
-
         # Get structures from MP as AbiPy ElectronBands.
-        from abipy.electrons.ebands import ElectronBands
-        self.mp_ebands_list = []
+        # The MP requests are executed in a thread so that the server can serve other events.
         with ActiveBar(self.mp_progress):
-            for mp_id in mp.ids:
-                if mp_id == "this": continue
-                eb = ElectronBands.from_mpid(mp_id)
-                self.mp_ebands_list.append(eb)
+            # Match Abinit structure with MP (only the ids are needed here)
+            mp_ids = await run_in_thread(self.abinit_ebands.structure.mp_match_ids)
+            if not mp_ids:
+                raise RuntimeError("No structure found in the MP database")
+
+            ebands_list = await run_in_thread(_ebands_from_mpids, mp_ids)
+            self.mp_ebands_list = [eb for eb in ebands_list if eb is not None]
 
+        self._upload_md5 = upload_md5
         self.update_main()
 
     def update_main(self):
@@ -117,17 +160,30 @@ The user can change the SKW intepolation parameters to gauge the quality of the
         self.ibz_file_input = pnw.FileInput(height=60, css_classes=["pnx-file-upload-area"])
         self.ibz_file_input.param.watch(self.on_ibz_file_input, "value")
         self.ebands_ibz = None
+        self._ibz_md5 = None
+        # Results of the SKW interpolation indexed by (id(ebands_ibz), lpratio, filter_params).
+        # The fit is the expensive step so it's not repeated if only the k-path file changes.
+        self._skw_cache = {}
 
         self.kpath_file_input = pnw.FileInput(height=60, css_classes=["pnx-file-upload-area"])
         self.kpath_file_input.param.watch(self.on_kpath_file_input, "value")
         self.ebands_kpath = None
+        self._kpath_md5 = None
 
     def on_ibz_file_input(self, event):
+        # Don't parse the file again if the same file is uploaded.
+        ibz_md5 = hashlib.md5(self.ibz_file_input.value).hexdigest()
+        if ibz_md5 == self._ibz_md5: return
         self.ebands_ibz = self.get_ebands_from_file_input(self.ibz_file_input)
+        self._ibz_md5 = ibz_md5
+        self._skw_cache.clear()
         self.update_main_area()
 
     def on_kpath_file_input(self, event):
+        kpath_md5 = hashlib.md5(self.kpath_file_input.value).hexdigest()
+        if kpath_md5 == self._kpath_md5: return
         self.ebands_kpath = self.get_ebands_from_file_input(self.kpath_file_input)
+        self._kpath_md5 = kpath_md5
         self.update_main_area()
 
     def update_main_area(self):
@@ -135,7 +191,11 @@ The user can change the SKW intepolation parameters to gauge the quality of the
         if self.ebands_kpath is None or self.ebands_ibz is None: return
 
         # SKW interpolation
-        r = self.ebands_ibz.interpolate(lpratio=5, filter_params=None)
+        lpratio, filter_params = 5, None
+        key = (id(self.ebands_ibz), lpratio, filter_params)
+        if key not in self._skw_cache:
+            self._skw_cache[key] = self.ebands_ibz.interpolate(lpratio=lpratio, filter_params=filter_params)
+        r = self._skw_cache[key]
 
         # Build plotter.
         plotter = self.ebands_kpath.get_plotter_with("Ab-initio", "SKW interp", r.ebands_kpath)
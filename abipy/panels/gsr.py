@@ -3,10 +3,9 @@
 import param
 import panel as pn
 import panel.widgets as pnw
-import bokeh.models.widgets as bkw
 
 from .core import (PanelWithElectronBands, NcFileMixin,
-  PanelWithEbandsRobot, ButtonContext, ply, mpl, dfc, depends_on_btn_click)
+  PanelWithEbandsRobot, ButtonContext, ply, mpl, dfc, depends_on_btn_click, summary_row)
 
 
 class GsrFilePanel(PanelWithElectronBands, NcFileMixin):
@@ -26,9 +25,7 @@ class GsrFilePanel(PanelWithElectronBands, NcFileMixin):
         """Return tabs with widgets to interact with the GSR file."""
         d = {}
 
-        d["Summary"] = pn.Row(
-            bkw.PreText(text=self.gsr.to_string(verbose=self.verbose),  sizing_mode="scale_both")
-        )
+        d["Summary"] = summary_row(self.gsr, self.verbose)
         d["e-Bands"] = pn.Row(
             self.pws_col(["### e-Bands Options", "with_gaps", "set_fermie_to_vbm", "plot_ebands_btn",
                           self.helpc("on_plot_ebands_btn")]),
@@ -47,7 +44,8 @@ class GsrFilePanel(PanelWithElectronBands, NcFileMixin):
             if not self.gsr.ebands.isnot_ibz_sampling():
                 d["Fermi Surface"] = self.get_ifermi_view()
 
-        d["Structure"] = self.get_struct_view_tab_entry()
+        # Built only when the tab is activated. See lazy_tabs.
+        d["Structure"] = self.get_struct_view_tab_entry
 
         # TODO
         #app(("NcFile", self.get_ncfile_panel()))
@@ -58,7 +56,7 @@ class GsrFilePanel(PanelWithElectronBands, NcFileMixin):
         #    self.get_software_stack())
         #))
 
-        if as_dict: return d
+        if as_dict: return {k: v() if callable(v) else v for k, v in d.items()}
         return self.get_template_from_tabs(d, template=kwargs.get("template", None))
 
 
@@ -73,9 +71,15 @@ class GsrRobotPanel(PanelWithEbandsRobot):
         self.gsr_dataframe_btn = pnw.Button(name="Compute", button_type='primary')
         self.transpose_gsr_dataframe = pnw.Checkbox(name='Transpose GSR dataframe')
 
+        # Dataframe computed by on_gsr_dataframe_btn. The robot does not change so it's computed only once.
+        self._df_cache = None
+
     @depends_on_btn_click('gsr_dataframe_btn')
     def on_gsr_dataframe_btn(self):
-        df = self.robot.get_dataframe(with_geo=True)
+        if self._df_cache is None:
+            self._df_cache = self.robot.get_dataframe(with_geo=True)
+
+        df = self._df_cache
         transpose = self.transpose_gsr_dataframe.value
 
         return pn.Column(dfc(df, transpose=transpose), sizing_mode='stretch_width')
@@ -84,8 +88,7 @@ class GsrRobotPanel(PanelWithEbandsRobot):
         """Return tabs with widgets to interact with the |GsrRobot|."""
         d = {}
 
-        d["Summary"] = pn.Row(bkw.PreText(text=self.robot.to_string(verbose=self.verbose),
-                               sizing_mode="scale_both"))
+        d["Summary"] = summary_row(self.robot, self.verbose)
         d["Plot-eBands"] = pn.Row(self.get_ebands_plotter_widgets(), self.on_ebands_plotter_btn)
 
         # Add e-DOS tab but only if all ebands have k-sampling.
@@ -3,9 +3,8 @@
 #import param
 import panel as pn
 import panel.widgets as pnw
-import bokeh.models.widgets as bkw
 
-from abipy.panels.core import AbipyParameterized, mpl, ply, depends_on_btn_click
+from abipy.panels.core import AbipyParameterized, mpl, ply, depends_on_btn_click, summary_row
 
 
 class HistFilePanel(AbipyParameterized):
@@ -24,6 +23,9 @@ class HistFilePanel(AbipyParameterized):
         self.to_unit_cell = pnw.Checkbox(name="To unit cell")
         self.view_relax_btn = pnw.Button(name="View relaxation", button_type="primary")
 
+        # (tuple with the selected quantities, column) of the last call to on_plot_relax_btn.
+        self._last_relax_plot = None
+
         super().__init__(**params)
 
     @depends_on_btn_click('plot_relax_btn')
@@ -32,11 +34,17 @@ class HistFilePanel(AbipyParameterized):
         Plot the evolution of structural parameters (lattice lengths, angles and volume)
         as well as pressure, info on forces and total energy.
         """
+        # Return the previous column if the selection has not changed.
+        what_tuple = tuple(self.what_list.value)
+        if self._last_relax_plot is not None and self._last_relax_plot[0] == what_tuple:
+            return self._last_relax_plot[1]
+
         col = pn.Column(sizing_mode="stretch_width"); ca = col.append
-        for what in self.what_list.value:
-            #ca(f"## {what}")
-            ca(ply(self.hist.plotly(what, title=what, show=False)))
+        if what_tuple:
+            # A single figure with one subplot for each quantity. The y-axes have the name of the quantity.
+            ca(ply(self.hist.plotly(list(what_tuple), show=False)))
 
+        self._last_relax_plot = (what_tuple, col)
         return col
 
     @depends_on_btn_click('view_relax_btn')
@@ -47,8 +55,7 @@ class HistFilePanel(AbipyParameterized):
         """Return tabs with widgets to interact with the HIST.nc file."""
         d = {}
 
-        d["Summary"] = pn.Row(bkw.PreText(text=self.hist.to_string(verbose=self.verbose),
-                              sizing_mode="scale_both"))
+        d["Summary"] = summary_row(self.hist, self.verbose)
 
         d["Plot"] = pn.Row(
                 self.pws_col(["### Plot Options", "what_list", "plot_relax_btn", self.helpc("on_plot_relax_btn")]),
@@ -9,7 +9,7 @@ import panel.widgets as pnw
 import bokeh.models.widgets as bkw
 
 from abipy.core.structure import Structure
-from abipy.panels.core import AbipyParameterized, PanelWithStructure, dfc, mpl, ply, depends_on_btn_click, Loading
+from abipy.panels.core import AbipyParameterized, PanelWithStructure, dfc, mpl, ply, depends_on_btn_click, Loading, run_in_thread
 
 
 def _make_targz_bytes(inp_or_multi, remove_dir=True):
@@ -429,7 +429,8 @@ Examples of AbiPy scripts to automate calculations without datasets are availabl
             self.pws_col(["### Convert structure", "output_format", self.helpc("convert")]),
             self.convert
         )
-        d["Viewer"] = self.get_struct_view_tab_entry()
+        # Built only when the tab is activated. See lazy_tabs.
+        d["Viewer"] = self.get_struct_view_tab_entry
         d["GS-input"] = pn.Row(
             self.pws_col(['### Generate GS input', "gs_type",
                           "spin_mode", "kppra", "smearing_type", "tsmear",
@@ -463,7 +464,7 @@ Examples of AbiPy scripts to automate calculations without datasets are availabl
                                       self.on_mp_match_btn,
                                       sizing_mode="stretch_width")
 
-        if as_dict: return d
+        if as_dict: return {k: v() if callable(v) else v for k, v in d.items()}
 
         return self.get_template_from_tabs(d, template=kwargs.get("template", None))
 
@@ -525,9 +526,9 @@ or through the Materials Project identifier (*mp-id*).
         os.remove(tmp_path)
         self.update_main_area()
 
-    def on_mpid_input(self, event):
+    async def on_mpid_input(self, event):
         with Loading(self.mpid_input, err_wdg=self.mpid_err_wdg):
-            self.input_structure = Structure.from_mpid(self.mpid_input.value)
+            self.input_structure = await run_in_thread(Structure.from_mpid, self.mpid_input.value)
 
         self.update_main_area()
 
@@ -1,5 +1,5 @@
 """"Panels to interact with the AbiPy tasks."""
-import param
+import time
 import panel as pn
 import panel.widgets as pnw
 import bokeh.models.widgets as bkw
@@ -7,6 +7,9 @@ import bokeh.models.widgets as bkw
 from io import StringIO
 from abipy.panels.core import AbipyParameterized, mpl, ply, dfc, depends_on_btn_click
 
+# Time in seconds during which the text produced by the flow methods is reused. See WorkPanel._get_text.
+_TEXT_CACHE_TTL = 3.0
+
 
 class WorkPanel(AbipyParameterized):
     """
@@ -56,19 +59,61 @@ class WorkPanel(AbipyParameterized):
 
         #files = pn.widgets.FileSelector('~')
 
+        # Text produced by the flow methods: key --> (time.monotonic() when computed, text). See _get_text.
+        self._text_cache = {}
+        # Buffer reused by _run_to_text instead of allocating a new StringIO at each click.
+        self._stream = StringIO()
+        # name --> (pn.Row, PreText widget) updated in-place by _get_text_row.
+        self._text_rows = {}
+
         super().__init__(**params)
 
+    def _run_to_text(self, func, **kwargs):
+        """
+        Call func(stream=stream, **kwargs) and return the text written to stream.
+        """
+        stream = self._stream
+        stream.seek(0)
+        stream.truncate()
+        func(stream=stream, **kwargs)
+        return stream.getvalue()
+
+    def _get_text(self, key, func, **kwargs):
+        """
+        Call func(stream=stream, **kwargs) and return the text written to stream.
+        The text is reused for _TEXT_CACHE_TTL seconds so that repeated clicks do not traverse the flow again.
+        """
+        now = time.monotonic()
+        entry = self._text_cache.get(key)
+        if entry is not None and now - entry[0] < _TEXT_CACHE_TTL:
+            return entry[1]
+
+        text = self._run_to_text(func, **kwargs)
+        self._text_cache[key] = (now, text)
+        return text
+
+    def _get_text_row(self, name, text):
+        """
+        Return the persistent row with the PreText widget associated to name after setting its text.
+        The same objects are returned at each click so that only the text is sent to the browser.
+        """
+        if name not in self._text_rows:
+            pre_text = bkw.PreText(text=text)
+            self._text_rows[name] = (pn.Row(pre_text), pre_text)
+
+        row, pre_text = self._text_rows[name]
+        pre_text.text = text
+        return row
+
     @depends_on_btn_click("status_btn")
     def on_status_btn(self):
-        stream = StringIO()
-        self.flow.show_status(stream=stream, nids=self.nids, verbose=self.verbose)
-        return pn.Row(bkw.PreText(text=stream.getvalue()))
+        text = self._get_text(("status", self.verbose), self.flow.show_status, nids=self.nids, verbose=self.verbose)
+        return self._get_text_row("status", text)
 
     @depends_on_btn_click("history_btn")
     def on_history_btn(self):
-        stream = StringIO()
-        self.flow.show_history(nids=self.nids, stream=stream)
-        return pn.Row(bkw.PreText(text=stream.getvalue()))
+        text = self._get_text("history", self.flow.show_history, nids=self.nids)
+        return self._get_text_row("history", text)
 
     @depends_on_btn_click("graphviz_btn")
     def on_graphviz_btn(self):
@@ -86,33 +131,29 @@ class WorkPanel(AbipyParameterized):
     @depends_on_btn_click("debug_btn")
     def on_debug_btn(self):
         #TODO https://github.com/ralphbean/ansi2html ?
-        stream = StringIO()
         #flow.debug(status=options.task_status, nids=selected_nids(flow, options))
-        self.flow.debug(stream=stream, nids=self.nids)
-        return pn.Row(bkw.PreText(text=stream.getvalue()))
+        text = self._run_to_text(self.flow.debug, nids=self.nids)
+        return self._get_text_row("debug", text)
 
     @depends_on_btn_click("events_btn")
     def on_events_btn(self):
-        stream = StringIO()
-        self.flow.show_events(nids=self.nids, stream=stream)
-        return pn.Row(bkw.PreText(text=stream.getvalue()))
+        text = self._get_text("events", self.flow.show_events, nids=self.nids)
+        return self._get_text_row("events", text)
 
     @depends_on_btn_click("corrections_btn")
     def on_corrections_btn(self):
-        stream = StringIO()
-        self.flow.show_corrections(stream=stream, nids=self.nids)
+        text = self._run_to_text(self.flow.show_corrections, nids=self.nids)
         #flow.show_corrections(status=options.task_status, nids=selected_nids(flow, options))
-        return pn.Row(bkw.PreText(text=stream.getvalue()))
+        return self._get_text_row("corrections", text)
 
     @depends_on_btn_click("handlers_btn")
     def on_handlers_btn(self):
-        stream = StringIO()
         #if options.doc:
         #    flowtk.autodoc_event_handlers()
         #else:
         #show_events(self, status=None, nids=None, stream=sys.stdout):
-        self.flow.show_event_handlers(verbose=self.verbose, nids=self.nids, stream=stream)
-        return pn.Row(bkw.PreText(text=stream.getvalue()))
+        text = self._run_to_text(self.flow.show_event_handlers, verbose=self.verbose, nids=self.nids)
+        return self._get_text_row("handlers", text)
 
     #@depends_on_btn_click("vars_btn")
     #def on_vars_btn(self):
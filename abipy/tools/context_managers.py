@@ -9,16 +9,33 @@ class Timer():
 
     .. example::
 
-        with Timer("Timing code section"):
+        with Timer("Timing code section") as timer:
             do_stuff()
+
+        print(timer.elapsed)
     """
 
-    def __init__(self, description):
+    def __init__(self, description, quiet=False):
+        """
+        Args:
+            description: String printed together with the elapsed time.
+            quiet: True to disable printing. The elapsed time is still available in `elapsed`.
+        """
         self.description = description
+        self.quiet = quiet
+        self.elapsed = None
+
+    def __repr__(self):
+        if self.elapsed is None:
+            return f"<{self.__class__.__name__}: {self.description}>"
+        return f"<{self.__class__.__name__}: {self.description}, elapsed: {self.elapsed:.4f} s>"
 
     def __enter__(self):
-        self.start = time.time()
+        self.start = time.perf_counter()
+        return self
 
     def __exit__(self, type, value, traceback):
-        self.end = time.time()
-        print(f"{self.description}.\n\tCompleted in {self.end - self.start:.4f} seconds\n")
+        self.end = time.perf_counter()
+        self.elapsed = self.end - self.start
+        if not self.quiet:
+            print(f"{self.description}.\n\tCompleted in {self.elapsed:.4f} seconds\n")
@@ -60,6 +60,17 @@ def add_periodic_replicas(arr):
     return oarr
 
 
+# cplx_mode --> function used by data_from_cplx_mode to extract the data.
+# Note that angle is not zero for real arrays (pi for negative values) hence np.angle is always called.
+_CPLX_MODE_FUNCS = {
+    "re": lambda arr: arr.real,
+    "im": lambda arr: arr.imag,
+    "all": lambda arr: arr,
+    "abs": np.abs,
+    "angle": lambda arr: np.angle(arr, deg=False),
+}
+
+
 def data_from_cplx_mode(cplx_mode, arr, tol=None):
     """
     Extract the data from the numpy array ``arr`` depending on the values of ``cplx_mode``.
@@ -73,21 +84,16 @@ def data_from_cplx_mode(cplx_mode, arr, tol=None):
             "angle" will display the phase of the complex number in radians.
         tol: If not None, values below tol are set to zero. Cannot be used with "angle"
     """
-    if cplx_mode == "re":
-        val = arr.real
-    elif cplx_mode == "im":
-        val = arr.imag
-    elif cplx_mode == "all":
-        val = arr
-    elif cplx_mode == "abs":
-        val = np.abs(arr)
-    elif cplx_mode == "angle":
-        val = np.angle(arr, deg=False)
-        if tol is not None:
-            raise ValueError("Tol cannot be used with cplx_mode = angle")
-    else:
+    try:
+        func = _CPLX_MODE_FUNCS[cplx_mode]
+    except (KeyError, TypeError):
         raise ValueError("Unsupported mode `%s`" % str(cplx_mode))
 
+    if cplx_mode == "angle" and tol is not None:
+        raise ValueError("Tol cannot be used with cplx_mode = angle")
+
+    val = func(arr)
+
     return val if tol is None else np.where(np.abs(val) > tol, val, 0)
 
 
@@ -296,6 +302,49 @@ def smooth(x, window_len=11, window='hanning'):
     return y[s:e]
 
 
+def lttb_downsample(x, y, n_out):
+    """
+    Downsample the curve (x, y) to ``n_out`` points with the Largest-Triangle-Three-Buckets algorithm.
+    See S. Steinarsson, Downsampling Time Series for Visual Representation, MSc thesis (2013).
+    The algorithm preserves the visual shape of the curve (peaks are kept) and is used to
+    reduce the number of points sent to the browser. The first and the last point are always kept.
+
+    Args:
+        x: Monotonic array with the abscissas.
+        y: Real array with the ordinates. Same length as x.
+        n_out: Number of points in output. Must be >= 3.
+
+    Return: (x, y) numpy arrays. The input arrays are returned if len(x) <= n_out.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if n_out < 3:
+        raise ValueError("n_out should be >= 3 while it is: %s" % n_out)
+    n = len(x)
+    if n <= n_out: return x, y
+
+    # Edges of the n_out - 2 buckets for the inner points. The width of each bucket is > 1.
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    inds = np.empty(n_out, dtype=int)
+    inds[0], inds[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average point in the next bucket (the last point for the last bucket).
+        if i + 2 < n_out - 1:
+            nstart, nstop = edges[i + 1], edges[i + 2]
+        else:
+            nstart, nstop = n - 1, n
+        avg_x, avg_y = x[nstart:nstop].mean(), y[nstart:nstop].mean()
+
+        # Select the point giving the largest triangle with the previously selected point and the average.
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + np.argmax(area)
+        inds[i + 1] = a
+
+    return x[inds], y[inds]
+
+
 def find_convindex(values, tol, min_numpts=1, mode="abs", vinf=None):
     """
     Given a list of values and a tolerance tol, returns the leftmost index for which
@@ -11,7 +11,7 @@ import time
 import itertools
 import numpy as np
 
-from collections import OrderedDict, namedtuple
+from collections import OrderedDict
 from pymatgen.util.plotting import add_fig_kwargs, get_ax_fig_plt, get_ax3d_fig_plt, get_axarray_fig_plt
 from .numtools import data_from_cplx_mode
 
@@ -114,20 +114,17 @@ def set_axlims(ax, lims, axname):
     left, right = None, None
     if lims is None: return (left, right)
 
-    len_lims = None
-    try:
-        len_lims = len(lims)
-    except TypeError:
-        # Assume Scalar
+    if np.ndim(lims) == 0:
+        # Scalar
         left = float(lims)
-
-    if len_lims is not None:
-        if len(lims) == 2:
-            left, right = lims[0], lims[1]
-        elif len(lims) == 1:
-            left = lims[0]
-
-    set_lim = getattr(ax, {"x": "set_xlim", "y": "set_ylim"}[axname])
+    elif len(lims) == 2:
+        left, right = lims[0], lims[1]
+    elif len(lims) == 1:
+        left = lims[0]
+
+    if axname not in ("x", "y"):
+        raise ValueError("Invalid axname: `%s`" % str(axname))
+    set_lim = getattr(ax, "set_%slim" % axname)
     if left != right:
         set_lim(left, right)
 
@@ -222,17 +219,16 @@ def plot_xy_with_hue(data, x, y, hue, decimals=None, ax=None,
         data = data.round({hue: decimals})
 
     ax, fig, plt = get_ax_fig_plt(ax=ax)
+    fmt_args = ('o-',) if not kwargs else ()
     for key, grp in data.groupby(hue):
         # Sort xs and rearrange ys
-        xy = np.array(sorted(zip(grp[x], grp[y]), key=lambda t: t[0]))
-        xvals, yvals = xy[:, 0], xy[:, 1]
+        xvals, yvals = grp[x].values, grp[y].values
+        isort = np.argsort(xvals, kind="stable")
+        xvals, yvals = xvals[isort], yvals[isort]
 
         #label = "{} = {}".format(hue, key)
         label = "%s" % (str(key))
-        if not kwargs:
-            ax.plot(xvals, yvals, 'o-', label=label)
-        else:
-            ax.plot(xvals, yvals, label=label, **kwargs)
+        ax.plot(xvals, yvals, *fmt_args, label=label, **kwargs)
 
     ax.grid(True)
     ax.set_xlabel(x)
@@ -244,6 +240,20 @@ def plot_xy_with_hue(data, x, y, hue, decimals=None, ax=None,
     return fig
 
 
+# Arrays with more elements are converted to single precision before calling imshow/matshow.
+_DISPLAY_FLOAT32_MIN_SIZE = 1_000_000
+
+
+def _to_display_array(data):
+    """
+    Return the array passed to imshow/matshow. Large float64 arrays are downcasted to float32
+    as the color mapping does not need double precision.
+    """
+    if data.dtype == np.float64 and data.size > _DISPLAY_FLOAT32_MIN_SIZE:
+        return data.astype(np.float32)
+    return data
+
+
 @add_fig_kwargs
 def plot_array(array, color_map=None, cplx_mode="abs", **kwargs):
     """
@@ -264,11 +274,13 @@ def plot_array(array, color_map=None, cplx_mode="abs", **kwargs):
             "abs" means that the absolute value of the complex number is shown.
             "angle" will display the phase of the complex number in radians.
 
+    Large arrays are shown in single precision.
+
     Returns: |matplotlib-Figure|
     """
-    # Handle vectors
-    array = np.atleast_2d(array)
-    array = data_from_cplx_mode(cplx_mode, array)
+    # Extract the data before handling vectors so that atleast_2d returns a view of the (real) result.
+    array = data_from_cplx_mode(cplx_mode, np.asarray(array))
+    array = _to_display_array(np.atleast_2d(array))
 
     import matplotlib as mpl
     from matplotlib import pyplot as plt
@@ -296,7 +308,7 @@ class ArrayPlotter(object):
         Args:
             labels_and_arrays: List [("label1", arr1), ("label2", arr2")]
         """
-        self._arr_dict = OrderedDict()
+        self._arr_dict = {}
         for label, array in labels_and_arrays:
             self.add_array(label, array)
 
@@ -332,12 +344,16 @@ class ArrayPlotter(object):
             self.add_array(label, arr)
 
     @add_fig_kwargs
-    def plot(self, cplx_mode="abs", colormap="jet", fontsize=8, **kwargs):
+    def plot(self, cplx_mode="abs", colormap="jet", fontsize=8, shared_colorbar=False, **kwargs):
         """
         Args:
             cplx_mode: "abs" for absolute value, "re", "im", "angle"
             colormap: matplotlib colormap.
             fontsize: legend and label fontsize.
+            shared_colorbar: True if all the arrays should use the same color scale.
+                A single colorbar is then added to the figure instead of one colorbar per array.
+
+        Large arrays are shown in single precision.
 
         Returns: |matplotlib-Figure|
         """
@@ -345,32 +361,41 @@ class ArrayPlotter(object):
         num_plots, ncols, nrows = len(self), 1, 1
         if num_plots > 1:
             ncols = 2
-            nrows = num_plots // ncols + (num_plots % ncols)
+            nrows, rem = divmod(num_plots, ncols)
+            nrows += int(rem > 0)
 
         import matplotlib.pyplot as plt
         fig, ax_mat = plt.subplots(nrows=nrows, ncols=ncols, sharex=False, sharey=False, squeeze=False)
-        # Don't show the last ax if num_plots is odd.
-        if num_plots % ncols != 0: ax_mat[-1, -1].axis("off")
+        # Don't show the trailing axes that are not used.
+        for ax in ax_mat.flat[num_plots:]: ax.axis("off")
 
         from mpl_toolkits.axes_grid1 import make_axes_locatable
         from matplotlib.ticker import MultipleLocator
 
-        for ax, (label, arr) in zip(ax_mat.flat, self.items()):
-            data = data_from_cplx_mode(cplx_mode, arr)
+        all_data = [_to_display_array(data_from_cplx_mode(cplx_mode, arr)) for arr in self._arr_dict.values()]
+        vmin, vmax = None, None
+        if shared_colorbar and all_data:
+            vmin = min(data.min() for data in all_data)
+            vmax = max(data.max() for data in all_data)
+
+        for ax, label, data in zip(ax_mat.flat, self.keys(), all_data):
             # Use origin to place the [0, 0] index of the array in the lower left corner of the axes.
-            img = ax.matshow(data, interpolation='nearest', cmap=colormap, origin='lower', aspect="auto")
+            img = ax.matshow(data, interpolation='nearest', cmap=colormap, origin='lower', aspect="auto",
+                             vmin=vmin, vmax=vmax)
             ax.set_title("(%s) %s" % (cplx_mode, label), fontsize=fontsize)
 
-            # Make a color bar for this ax
-            # Create divider for existing axes instance
-            # http://stackoverflow.com/questions/18266642/multiple-imshow-subplots-each-with-colorbar
-            divider3 = make_axes_locatable(ax)
-            # Append axes to the right of ax, with 10% width of ax
-            cax3 = divider3.append_axes("right", size="10%", pad=0.05)
-            # Create colorbar in the appended axes
-            # Tick locations can be set with the kwarg `ticks`
-            # and the format of the ticklabels with kwarg `format`
-            cbar3 = plt.colorbar(img, cax=cax3, ticks=MultipleLocator(0.2), format="%.2f")
+            if not shared_colorbar:
+                # Make a color bar for this ax
+                # Create divider for existing axes instance
+                # http://stackoverflow.com/questions/18266642/multiple-imshow-subplots-each-with-colorbar
+                divider3 = make_axes_locatable(ax)
+                # Append axes to the right of ax, with 10% width of ax
+                cax3 = divider3.append_axes("right", size="10%", pad=0.05)
+                # Create colorbar in the appended axes
+                # Tick locations can be set with the kwarg `ticks`
+                # and the format of the ticklabels with kwarg `format`
+                cbar3 = plt.colorbar(img, cax=cax3, ticks=MultipleLocator(0.2), format="%.2f")
+
             # Remove xticks from ax
             ax.xaxis.set_visible(False)
             # Manually set ticklocations
@@ -379,13 +404,17 @@ class ArrayPlotter(object):
             # Set grid
             ax.grid(True, color='white')
 
+        # tight_layout must be called before adding the shared colorbar that steals space from all the axes.
         fig.tight_layout()
+        if shared_colorbar and all_data:
+            fig.colorbar(img, ax=ax_mat.ravel().tolist(), ticks=MultipleLocator(0.2), format="%.2f")
+
         return fig
 
 
-#TODO use object and introduce c for color, client code should be able to customize it.
+#TODO introduce c for color, client code should be able to customize it.
 # Rename it to ScatterData
-class Marker(namedtuple("Marker", "x y s")):
+class Marker(object):
     """
     Stores the position and the size of the marker.
     A marker is a list of tuple(x, y, s) where x, and y are the position
@@ -398,26 +427,38 @@ class Marker(namedtuple("Marker", "x y s")):
         marker = Marker(x, y, s)
         marker.extend((x, y, s))
 
+    The object behaves like the tuple (x, y, s) so that it can be unpacked and indexed.
     """
-    def __new__(cls, *xys):
-        """Extends the base class adding consistency check."""
+    __slots__ = ("x", "y", "s")
+
+    def __init__(self, *xys):
+        """Build the object with consistency check."""
         if not xys:
-            xys = ([], [], [])
-            return super().__new__(cls, *xys)
+            self.x, self.y, self.s = [], [], []
+            return
 
         if len(xys) != 3:
             raise TypeError("Expecting 3 entries in xys got %d" % len(xys))
 
-        x = np.asarray(xys[0])
-        y = np.asarray(xys[1])
-        s = np.asarray(xys[2])
-        xys = (x, y, s)
+        self.x = np.asarray(xys[0])
+        self.y = np.asarray(xys[1])
+        self.s = np.asarray(xys[2])
 
-        for s in xys[-1]:
-            if np.iscomplex(s):
-                raise ValueError("Found ambiguous complex entry %s" % str(s))
+        # Real arrays are accepted without inspecting the entries.
+        if np.iscomplexobj(self.s) and np.any(self.s.imag != 0):
+            raise ValueError("Found ambiguous complex entry in %s" % str(self.s))
 
-        return super().__new__(cls, *xys)
+    def __iter__(self):
+        return iter((self.x, self.y, self.s))
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.s)[index]
+
+    def __len__(self):
+        return 3
+
+    def __repr__(self):
+        return "%s(x=%r, y=%r, s=%r)" % (self.__class__.__name__, self.x, self.y, self.s)
 
     def __bool__(self):
         return bool(len(self.s))
@@ -431,33 +472,24 @@ class Marker(namedtuple("Marker", "x y s")):
         if len(xys) != 3:
             raise TypeError("Expecting 3 entries in xys got %d" % len(xys))
 
-        self.x.extend(xys[0])
-        self.y.extend(xys[1])
-        self.s.extend(xys[2])
-
-        lens = np.array((len(self.x), len(self.y), len(self.s)))
-        if np.any(lens != lens[0]):
+        lens = (len(self.x) + len(xys[0]), len(self.y) + len(xys[1]), len(self.s) + len(xys[2]))
+        if not (lens[0] == lens[1] == lens[2]):
             raise TypeError("x, y, s vectors should have same lengths but got %s" % str(lens))
 
+        self.x = np.concatenate((self.x, xys[0]))
+        self.y = np.concatenate((self.y, xys[1]))
+        self.s = np.concatenate((self.s, xys[2]))
+
     def posneg_marker(self):
         """
         Split data into two sets: the first one contains all the points with positive size.
         The first set contains all the points with negative size.
         """
-        pos_x, pos_y, pos_s = [], [], []
-        neg_x, neg_y, neg_s = [], [], []
-
-        for x, y, s in zip(self.x, self.y, self.s):
-            if s >= 0.0:
-                pos_x.append(x)
-                pos_y.append(y)
-                pos_s.append(s)
-            else:
-                neg_x.append(x)
-                neg_y.append(y)
-                neg_s.append(s)
+        x, y, s = np.asarray(self.x), np.asarray(self.y), np.asarray(self.s)
+        pos = s >= 0.0
+        neg = ~pos
 
-        return self.__class__(pos_x, pos_y, pos_s), Marker(neg_x, neg_y, neg_s)
+        return self.__class__(x[pos], y[pos], s[pos]), Marker(x[neg], y[neg], s[neg])
 
 
 class MplExpose(object): # pragma: no cover
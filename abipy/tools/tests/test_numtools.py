@@ -67,3 +67,20 @@ class TestNumTools(AbipyTest):
 
         assert lorentzian(x=0.0, width=1.0, center=0.0, height=1.0) == 1.0
         self.assert_almost_equal(lorentzian(x=0.0, width=1.0, center=0.0, height=None), 1/np.pi)
+
+    def test_lttb_downsample(self):
+        """Testing lttb_downsample."""
+        x = np.linspace(0, 10, 5001)
+        y = np.exp(-(x - 3.3) ** 2 / 0.01)
+        xs, ys = lttb_downsample(x, y, 200)
+        assert len(xs) == len(ys) == 200
+        assert xs[0] == x[0] and xs[-1] == x[-1]
+        assert np.all(np.diff(xs) > 0)
+        # The peak must be preserved.
+        assert ys.max() > 0.95
+
+        # No downsampling if n_out >= len(x)
+        xs, ys = lttb_downsample(x[:10], y[:10], 200)
+        assert len(xs) == 10
+        with self.assertRaises(ValueError):
+            lttb_downsample(x, y, 2)
@@ -99,6 +99,8 @@ class TestPlotting(AbipyTest):
 
         if self.has_matplotlib():
             plotter.plot(cplx_mode="re", show=False)
+            fig = plotter.plot(cplx_mode="abs", shared_colorbar=True, show=False)
+            assert len(fig.axes) == 4 + 1
 
     def test_marker(self):
         """Testing Marker."""
@@ -124,6 +126,13 @@ class TestPlotting(AbipyTest):
             x.append(-1)
             marker.extend((x, y, s))
 
+        # Extend a marker initialized with arrays.
+        marker = Marker(x[:3], y, s)
+        marker.extend((x[:3], y, s))
+        assert len(marker.x) == len(marker.y) == len(marker.s) == 6
+        xx, yy, ss = marker
+        self.assert_equal(ss, s + s)
+
     def test_plot_cell_tools(self):
         """Testing plot_unit_cell."""
         lattice = abilab.Lattice.hexagonal(a=2, c=4)